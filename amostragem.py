@@ -0,0 +1,94 @@
+import numpy as np
+
+
+# ~2 pontos por pixel na largura típica do container do Streamlit
+PONTOS_PADRAO = 1500
+
+
+def _como_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").view("int64").astype("float64")
+    return x.astype("float64")
+
+
+def _baldes(n, n_baldes):
+    # Divide os pontos internos [1, n-1) em baldes contíguos e não vazios
+    bordas = np.linspace(1, n - 1, n_baldes + 1).astype("int64")
+    inicio, fim = bordas[:-1], bordas[1:]
+    balde = np.repeat(np.arange(n_baldes), fim - inicio)
+    return inicio, fim, balde
+
+
+def _argmax_por_balde(valores, inicio, balde):
+    # Primeiro índice do maior valor em cada balde, sem ordenar o vetor inteiro
+    maximo = np.maximum.reduceat(valores, inicio)
+    candidatos = np.flatnonzero(valores == maximo[balde])
+    _, primeiro = np.unique(balde[candidatos], return_index=True)
+    return candidatos[primeiro]
+
+
+def lttb(x, y, n_saida):
+    # Largest-Triangle-Three-Buckets vetorizado: o vértice A de cada balde é a média do
+    # balde anterior (e não o ponto escolhido nele), o que elimina a dependência sequencial
+    xf, yf = _como_float(x), np.asarray(y, dtype="float64")
+    n = len(xf)
+    if n_saida >= n or n_saida < 3:
+        return np.arange(n)
+
+    inicio, fim, balde = _baldes(n, n_saida - 2)
+    tamanhos = fim - inicio
+    soma_x = np.concatenate(([0.0], np.cumsum(xf)))
+    soma_y = np.concatenate(([0.0], np.cumsum(yf)))
+    media_x = (soma_x[fim] - soma_x[inicio]) / tamanhos
+    media_y = (soma_y[fim] - soma_y[inicio]) / tamanhos
+
+    ax = np.concatenate(([xf[0]], media_x[:-1]))[balde]
+    ay = np.concatenate(([yf[0]], media_y[:-1]))[balde]
+    cx = np.concatenate((media_x[1:], [xf[-1]]))[balde]
+    cy = np.concatenate((media_y[1:], [yf[-1]]))[balde]
+
+    px, py = xf[1:n - 1], yf[1:n - 1]
+    area = np.abs((ax - cx) * (py - ay) - (ax - px) * (cy - ay))
+
+    escolhidos = _argmax_por_balde(area, inicio - 1, balde) + 1
+    return np.concatenate(([0], escolhidos, [n - 1]))
+
+
+def minmax(x, y, n_saida):
+    # Mantém o mínimo e o máximo de cada balde: nenhuma queda ou pico some do gráfico
+    yf = np.asarray(y, dtype="float64")
+    n = len(yf)
+    if n_saida >= n or n_saida < 4:
+        return np.arange(n)
+
+    inicio, _, balde = _baldes(n, (n_saida - 2) // 2)
+    internos = yf[1:n - 1]
+    menores = _argmax_por_balde(-internos, inicio - 1, balde) + 1
+    maiores = _argmax_por_balde(internos, inicio - 1, balde) + 1
+    return np.unique(np.concatenate(([0], menores, maiores, [n - 1])))
+
+
+def reduzir(x, y, n_saida=PONTOS_PADRAO, metodo="minmax-lttb"):
+    # Devolve os índices dos pontos a desenhar, em ordem crescente
+    n = len(y)
+    if n <= n_saida:
+        return np.arange(n)
+    if metodo == "lttb":
+        return lttb(x, y, n_saida)
+    if metodo == "minmax":
+        return minmax(x, y, n_saida)
+    if metodo != "minmax-lttb":
+        raise ValueError(f"Método de redução desconhecido: {metodo}")
+
+    # MinMaxLTTB: pré-seleciona extremos (barato) e roda o LTTB só sobre eles
+    candidatos = minmax(x, y, n_saida * 4)
+    xs = np.asarray(x)[candidatos]
+    ys = np.asarray(y, dtype="float64")[candidatos]
+    return candidatos[lttb(xs, ys, n_saida)]
+
+
+def reduzir_df(df, x, y, n_saida=PONTOS_PADRAO, metodo="minmax-lttb"):
+    validos = df[df[y].notna()]
+    indices = reduzir(validos[x].to_numpy(), validos[y].to_numpy(), n_saida, metodo)
+    return validos.iloc[indices]
@@ -0,0 +1,270 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+import diagnostico
+import serie_temporal
+from estatisticas import LIMITE_QUEDA_MBPS, limiares_recomendados, sequencias
+from registro import versao
+
+
+# Mediana e MAD em janelas consecutivas de JANELA amostras: cada amostra é comparada com a
+# janela anterior e com a própria. Uma mediana deslizante amostra a amostra custa ~0,5 s por
+# milhão de amostras; janelas fixas viram um np.median sobre uma matriz, ~30 ms
+JANELA = 30
+LIMIAR_MAD = 5.0
+QUEDA_RELATIVA = 0.3
+
+# CUSUM bilateral sobre o valor padronizado pela referência atual: ignora desvios de até
+# k escalas e alarma quando a soma passa de h (um degrau de 3 escalas alarma em ~5 amostras)
+CUSUM_K = 1.0
+CUSUM_H = 10.0
+CUSUM_Z_MAX = 4.0
+CUSUM_AQUECIMENTO = 100
+BLOCO_CUSUM = 8192
+
+
+@dataclass(frozen=True)
+class Anomalias:
+    # Instantes em ms do horário local desde 1970, como em serie_temporal; janelas vão do
+    # primeiro instante afetado até a primeira amostra recuperada
+    quedas_ms: np.ndarray
+    quedas_valor: np.ndarray
+    quedas_referencia: np.ndarray
+    sem_conexao: tuple
+    mudancas_ms: np.ndarray
+    mudancas_antes: np.ndarray
+    mudancas_depois: np.ndarray
+    abaixo: dict
+
+
+def _escala(valores, mediana):
+    # 1,4826·MAD estima o desvio padrão; o piso evita alarmes em séries quase constantes
+    mad = np.median(np.abs(valores - np.expand_dims(mediana, -1)), axis=-1)
+    return np.maximum(np.maximum(1.4826 * mad, 0.05 * np.abs(mediana)), 0.1)
+
+
+def _cusum(passos, inicial):
+    # max(0, S + x) acumulado sem laço: S_t = D_t − min(0, min_{j≤t} D_j), com D = S0 + cumsum
+    d = inicial + np.cumsum(passos)
+    return d - np.minimum(np.minimum.accumulate(d), 0.0)
+
+
+class _Janelas:
+    # Janelas de uma máscara que chega em lotes: a que termina aberta num lote continua no próximo
+    def __init__(self):
+        self.inicios, self.fins = [], []
+        self.aberta = None
+
+    def adicionar(self, instantes_ms, mascara):
+        if not len(mascara):
+            return
+        inicios, fins = sequencias(mascara)
+        t_inicio = instantes_ms[inicios]
+        if self.aberta is not None:
+            if len(inicios) and inicios[0] == 0:
+                t_inicio[0] = self.aberta
+            else:
+                self.inicios.append(np.array([self.aberta]))
+                self.fins.append(instantes_ms[:1])
+            self.aberta = None
+        if len(fins) and fins[-1] == len(mascara):
+            self.aberta = int(t_inicio[-1])
+            t_inicio, fins = t_inicio[:-1], fins[:-1]
+        self.inicios.append(t_inicio)
+        self.fins.append(instantes_ms[fins])
+
+    def copia(self):
+        outra = _Janelas()
+        outra.inicios, outra.fins, outra.aberta = list(self.inicios), list(self.fins), self.aberta
+        return outra
+
+    def janelas(self, ultimo_ms):
+        inicios = np.concatenate(self.inicios + [np.array([self.aberta] if self.aberta is not None else [], dtype="int64")])
+        fins = np.concatenate(self.fins + [np.array([ultimo_ms] if self.aberta is not None else [], dtype="int64")])
+        return inicios.astype("int64"), fins.astype("int64")
+
+
+class DetectorIncremental:
+    # Amostras entram em lotes de qualquer tamanho. Quedas de conexão e CUSUM avançam amostra
+    # a amostra; quedas bruscas e limiares fecham a cada JANELA amostras, e a janela
+    # incompleta é avaliada provisoriamente a cada resultado()
+    def __init__(self, limiares=None, janela=JANELA):
+        self.limiares = limiares_recomendados() if limiares is None else limiares
+        self.janela = janela
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.marca = 0
+        self.versao = None
+        self.amostras = 0
+        self.ultimo_ms = None
+        self._pendentes_ms = np.empty(0, dtype="int64")
+        self._pendentes = np.empty(0)
+        self._anterior = None
+        self._quedas = ([], [], [])
+        self._abaixo = {uso: _Janelas() for uso in self.limiares}
+        self._sem_conexao = _Janelas()
+        self._aquecimento = np.empty(0)
+        self._referencia = None
+        self._escala = None
+        self._somas = [0.0, 0.0]
+        self._excursoes = [None, None]
+        self._mudanca_pendente = None
+        self._mudancas = []
+
+    def incorporar(self, instantes_ms, valores):
+        instantes_ms = np.asarray(instantes_ms, dtype="int64")
+        valores = np.asarray(valores, dtype="float64")
+        if not len(valores):
+            return
+        self.amostras += len(valores)
+        self.ultimo_ms = int(instantes_ms[-1])
+
+        # Falha de medição conta como queda de conexão, como em estatisticas
+        sem_conexao = np.isnan(valores) | (np.nan_to_num(valores) < LIMITE_QUEDA_MBPS)
+        self._sem_conexao.adicionar(instantes_ms, sem_conexao)
+        self._cusum(instantes_ms[~sem_conexao], valores[~sem_conexao])
+
+        instantes_ms = np.concatenate((self._pendentes_ms, instantes_ms))
+        valores = np.concatenate((self._pendentes, valores))
+        completas = len(valores) // self.janela * self.janela
+        self._anterior = self._janelas(instantes_ms[:completas], valores[:completas], self._anterior,
+                                       self._quedas, self._abaixo)
+        self._pendentes_ms, self._pendentes = instantes_ms[completas:], valores[completas:]
+
+    def _janelas(self, instantes_ms, valores, anterior, quedas, abaixo):
+        if not len(valores):
+            return anterior
+        preenchidos = np.nan_to_num(valores).reshape(-1, min(self.janela, len(valores)))
+        mediana = np.median(preenchidos, axis=1)
+        escala = _escala(preenchidos, mediana)
+        mediana_ant = np.concatenate(([mediana[0] if anterior is None else anterior[0]], mediana[:-1]))
+        escala_ant = np.concatenate(([escala[0] if anterior is None else anterior[1]], escala[:-1]))
+
+        # Abaixo da janela anterior e da própria: um degrau para baixo não marca a janela
+        # inteira, quem o registra é o CUSUM
+        valido = preenchidos >= LIMITE_QUEDA_MBPS
+        queda = (
+            valido
+            & ((preenchidos - mediana_ant[:, None]) / escala_ant[:, None] < -LIMIAR_MAD)
+            & ((preenchidos - mediana[:, None]) / escala[:, None] < -LIMIAR_MAD)
+            & (preenchidos < (1 - QUEDA_RELATIVA) * mediana_ant[:, None])
+        )
+        posicoes = np.flatnonzero(queda.ravel())
+        quedas[0].append(instantes_ms[posicoes])
+        quedas[1].append(preenchidos.ravel()[posicoes])
+        quedas[2].append(np.repeat(mediana_ant, preenchidos.shape[1])[posicoes])
+
+        inicio_janela = instantes_ms[::preenchidos.shape[1]]
+        for uso, limiar in self.limiares.items():
+            abaixo[uso].adicionar(inicio_janela, mediana < limiar)
+        return mediana[-1], escala[-1]
+
+    def _cusum(self, instantes_ms, valores):
+        i = 0
+        while i < len(valores):
+            if self._referencia is None:
+                # (Re)aquecimento: referência e escala vêm das próximas amostras com conexão
+                falta = CUSUM_AQUECIMENTO - len(self._aquecimento)
+                self._aquecimento = np.concatenate((self._aquecimento, valores[i:i + falta]))
+                i += falta
+                if len(self._aquecimento) < CUSUM_AQUECIMENTO:
+                    return
+                self._referencia = float(np.median(self._aquecimento))
+                self._escala = float(_escala(self._aquecimento, self._referencia))
+                self._aquecimento = np.empty(0)
+                if self._mudanca_pendente is not None:
+                    self._mudancas.append((*self._mudanca_pendente, self._referencia))
+                    self._mudanca_pendente = None
+                continue
+
+            bloco = valores[i:i + BLOCO_CUSUM]
+            tempos = instantes_ms[i:i + BLOCO_CUSUM]
+            # O recorte impede que uma única amostra extrema dispare o alarme sozinha
+            z = np.clip((bloco - self._referencia) / self._escala, -CUSUM_Z_MAX, CUSUM_Z_MAX)
+            lados = (_cusum(z - CUSUM_K, self._somas[0]), _cusum(-z - CUSUM_K, self._somas[1]))
+            alarmes = np.flatnonzero((lados[0] > CUSUM_H) | (lados[1] > CUSUM_H))
+            fim = alarmes[0] + 1 if len(alarmes) else len(bloco)
+
+            # Cada lado lembra onde começou a excursão atual: logo depois do último zero
+            for lado, soma in enumerate(lados):
+                zeros = np.flatnonzero(soma[:fim] == 0)
+                if len(zeros):
+                    self._excursoes[lado] = int(tempos[zeros[-1] + 1]) if zeros[-1] + 1 < len(bloco) else None
+                elif self._excursoes[lado] is None:
+                    self._excursoes[lado] = int(tempos[0])
+
+            if not len(alarmes):
+                self._somas = [float(lados[0][-1]), float(lados[1][-1])]
+                i += len(bloco)
+                continue
+
+            # Novo patamar: a referência é refeita com as amostras seguintes ao alarme
+            a = alarmes[0]
+            lado = 0 if lados[0][a] > CUSUM_H else 1
+            self._mudanca_pendente = (self._excursoes[lado], self._referencia)
+            self._referencia = self._escala = None
+            self._somas = [0.0, 0.0]
+            self._excursoes = [None, None]
+            i += a + 1
+
+    def resultado(self):
+        quedas = tuple(list(lista) for lista in self._quedas)
+        abaixo = {uso: janelas.copia() for uso, janelas in self._abaixo.items()}
+        self._janelas(self._pendentes_ms, self._pendentes, self._anterior, quedas, abaixo)
+
+        # Mudança ainda em aquecimento: o novo patamar é a mediana do que já chegou
+        mudancas = list(self._mudancas)
+        if self._mudanca_pendente is not None:
+            depois = float(np.median(self._aquecimento)) if len(self._aquecimento) else np.nan
+            mudancas.append((*self._mudanca_pendente, depois))
+        mudancas = np.array(mudancas, dtype="float64").reshape(-1, 3)
+
+        vazio = [np.empty(0)]
+        ultimo = self.ultimo_ms if self.ultimo_ms is not None else 0
+        return Anomalias(
+            quedas_ms=np.concatenate(quedas[0] + [np.empty(0, dtype="int64")]).astype("int64"),
+            quedas_valor=np.concatenate(quedas[1] + vazio),
+            quedas_referencia=np.concatenate(quedas[2] + vazio),
+            sem_conexao=self._sem_conexao.janelas(ultimo),
+            mudancas_ms=mudancas[:, 0].astype("int64"),
+            mudancas_antes=mudancas[:, 1],
+            mudancas_depois=mudancas[:, 2],
+            abaixo={uso: (self.limiares[uso], *janelas.janelas(ultimo)) for uso, janelas in abaixo.items()},
+        )
+
+
+def detectar(instantes_ms, valores, limiares=None):
+    detector = DetectorIncremental(limiares)
+    detector.incorporar(instantes_ms, valores)
+    return detector.resultado()
+
+
+_detectores = {}
+_trava = threading.Lock()
+
+
+def do_conjunto(conjunto):
+    # Como incremental.do_conjunto (inclusive a trava por conjunto), mas lendo do armazém da
+    # série: só (id, instante, valor) das amostras além da marca d'água, sem montar DataFrame
+    caminho = serie_temporal.sincronizar(conjunto)
+    with _trava:
+        detector, trava = _detectores.setdefault(conjunto.id, (DetectorIncremental(), threading.Lock()))
+
+    with trava:
+        atual = versao(conjunto)
+        diagnostico.cache("anomalias.detector", detector.versao == atual)
+        if detector.versao != atual:
+            with diagnostico.trecho("anomalias.incorporar", conjunto=conjunto.id) as info:
+                # O banco do coletor só cresce; no armazém local a série é substituída a cada versão
+                if caminho != conjunto.arquivo and detector.versao is not None:
+                    detector.reiniciar()
+                ids, instantes, valores = serie_temporal.amostras_desde(caminho, conjunto.site, conjunto.rede, detector.marca)
+                if len(ids):
+                    detector.incorporar(instantes, valores)
+                    detector.marca = int(ids[-1])
+                detector.versao = atual
+                info["novas"] = len(ids)
+        return detector.resultado()
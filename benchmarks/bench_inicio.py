@@ -0,0 +1,83 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Orçamento de inicialização por página, num processo novo: tempo até a primeira
+# renderização completa (inclui subir o interpretador e o Streamlit) e RSS máximo
+ORCAMENTO = {
+    "rede": {"segundos": 3.5, "rss_mb": 230},
+    "equipamentos": {"segundos": 1.8, "rss_mb": 110},
+}
+
+# Módulos que não podem ser carregados para abrir a página
+PROIBIDOS = {
+    "rede": ("matplotlib",),
+    "equipamentos": ("matplotlib", "pandas", "plotly.express", "pyarrow"),
+}
+
+FILHO = """
+import json, resource, sys, time
+from streamlit.testing.v1 import AppTest
+
+inicio, arquivo, pagina = float(sys.argv[1]), sys.argv[2], sys.argv[3]
+app = AppTest.from_file(arquivo, default_timeout=120)
+app.query_params["pagina"] = pagina
+app.run()
+segundos = time.time() - inicio
+print(json.dumps({
+    "segundos": segundos,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modulos": sorted(sys.modules),
+    "erros": [e.message for e in app.exception],
+}))
+"""
+
+
+def medir(pagina):
+    processo = subprocess.run(
+        [sys.executable, "-c", FILHO, repr(time.time()), str(RAIZ / "recepcao.py"), pagina],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede e impõe o orçamento de inicialização de cada página")
+    parser.add_argument("--repeticoes", type=int, default=3, help="usa a mediana de N processos novos")
+    parser.add_argument("--saida", type=Path, help="grava as medições em JSON")
+    args = parser.parse_args(argv)
+
+    falhas, medicoes = [], {}
+    for pagina, limites in ORCAMENTO.items():
+        execucoes = [medir(pagina) for _ in range(args.repeticoes)]
+        erros = [erro for e in execucoes for erro in e["erros"]]
+        segundos = sorted(e["segundos"] for e in execucoes)[len(execucoes) // 2]
+        rss_mb = max(e["rss_mb"] for e in execucoes)
+        carregados = [m for m in PROIBIDOS[pagina] if m in execucoes[0]["modulos"]]
+        medicoes[pagina] = {"segundos": round(segundos, 3), "rss_mb": round(rss_mb, 1)}
+
+        print(f"{pagina:14s} {segundos:6.2f} s (limite {limites['segundos']:.1f})  "
+              f"{rss_mb:6.1f} MB (limite {limites['rss_mb']})")
+        if erros:
+            falhas.append(f"{pagina}: exceção na página: {erros[0]}")
+        if segundos > limites["segundos"]:
+            falhas.append(f"{pagina}: {segundos:.2f} s acima do orçamento")
+        if rss_mb > limites["rss_mb"]:
+            falhas.append(f"{pagina}: {rss_mb:.1f} MB acima do orçamento")
+        if carregados:
+            falhas.append(f"{pagina}: carregou {', '.join(carregados)}")
+
+    if args.saida:
+        args.saida.write_text(json.dumps(medicoes, indent=2), encoding="utf-8")
+    for falha in falhas:
+        print(f"ORÇAMENTO ESTOURADO: {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
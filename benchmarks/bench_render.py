@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+TAMANHOS_PADRAO = (1_000, 10_000, 100_000, 1_000_000)
+MAX_LINHAS_PLANILHA = 100_000
+IMAGENS_PADRAO = (10, 50)
+
+# Tempo varia muito entre máquinas e execuções; memória e bytes enviados são quase determinísticos
+TOLERANCIA_PADRAO = {"segundos": 1.0, "pico_mb": 0.25, "bytes": 0.10}
+
+
+def medir(resultados, caso, funcao, *args, **kwargs):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    retorno = funcao(*args, **kwargs)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resultados[caso] = {"segundos": round(segundos, 4), "pico_mb": round(pico / 2**20, 2)}
+    return retorno
+
+
+def preparar_ambiente(destino):
+    # Cópia do app num diretório temporário: o registro e o catálogo sintéticos não tocam no repositório
+    for arquivo in RAIZ.glob("*.py"):
+        shutil.copy(arquivo, destino)
+    shutil.copy(RAIZ / "equipamentos.json", destino)
+    shutil.copytree(RAIZ / ".streamlit", destino / ".streamlit")
+    (destino / "images").mkdir()
+
+
+def serie_sintetica(n, semente=0):
+    aleatorio = np.random.default_rng(semente)
+    instantes = 1_735_689_600_000 + np.arange(n, dtype=np.int64) * 1000
+    valores = aleatorio.normal(150, 25, n).clip(min=0)
+    # Quedas e falhas espalhadas, como na rede antiga
+    valores[aleatorio.choice(n, size=max(1, n // 500), replace=False)] = 0.0
+    valores[aleatorio.choice(n, size=max(1, n // 1000), replace=False)] = np.nan
+    return instantes, valores
+
+
+def gerar_imagens(destino, quantidade, semente=0):
+    from PIL import Image
+
+    aleatorio = np.random.default_rng(semente)
+    equipamentos = []
+    for i in range(quantidade):
+        # Ruído com gradiente: comprime mal em JPEG, como as fotos de celular reais
+        pixels = (aleatorio.integers(0, 64, (1600, 1200, 3)) + np.linspace(0, 191, 1200)[None, :, None]).astype("uint8")
+        arquivo = f"images/sintetica_{i:03d}.jpeg"
+        Image.fromarray(pixels).save(destino / arquivo, quality=90)
+        equipamentos.append({
+            "id": f"sintetico-{i}",
+            "site": "Sintético",
+            "tipo": "Access Point",
+            "status": "em uso",
+            "nome": f"Equipamento {i}",
+            "imagens": [{"arquivo": arquivo, "legenda": f"Foto sintética {i}"}],
+            "descricao": f"- Modelo: **Equipamento {i}**\n",
+        })
+    with open(destino / "equipamentos.json", "w", encoding="utf-8") as arquivo:
+        json.dump(equipamentos, arquivo, ensure_ascii=False)
+
+
+def bytes_da_arvore(no):
+    total = 0
+    proto = getattr(no, "proto", None)
+    if proto is not None and hasattr(proto, "SerializeToString"):
+        total += len(proto.SerializeToString())
+    filhos = getattr(no, "children", None)
+    if isinstance(filhos, dict):
+        total += sum(bytes_da_arvore(filho) for filho in filhos.values())
+    return total
+
+
+def bytes_das_imagens(app, destino):
+    # Miniaturas referenciadas no HTML (variante 1x), que o navegador baixa do servidor estático
+    total = 0
+    for markdown in app.markdown:
+        for url in re.findall(r'<img src="app/static/([^"]+)"', markdown.value):
+            caminho = destino / "static" / url.replace("%20", " ")
+            total += caminho.stat().st_size if caminho.exists() else 0
+    return total
+
+
+def rodar_app(destino, preparar=None):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(destino / "recepcao.py"), default_timeout=600)
+    app.run()
+    if preparar:
+        preparar(app)
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return app
+
+
+def bench_dados(resultados, destino, n):
+    import amostragem
+    import anomalias
+    import compacto
+    import dados
+    import estatisticas
+    import graficos
+    import serie_temporal
+
+    instantes, valores = serie_sintetica(n)
+    banco = destino / f"serie_{n}.sqlite"
+    medir(resultados, f"serie.importar[{n}]", serie_temporal.importar_em_lote, banco, "Bench", f"N{n}", "bench", instantes, valores)
+
+    if n <= MAX_LINHAS_PLANILHA:
+        import pandas as pd
+
+        horas = pd.Timestamp(0) + pd.to_timedelta(instantes, unit="ms")
+        planilha = destino / f"planilha_{n}.xlsx"
+        pd.DataFrame({
+            "Timestamp": horas.normalize(),
+            "Download (Mbps)": valores,
+            "hora": horas.strftime("%H:%M:%S"),
+        }).to_excel(planilha, index=False)
+        medir(resultados, f"planilha.leitura[{n}]", dados.ler_planilha, planilha)
+
+    # Segmento mapeado: abrir não lê os vetores, e a fatia de um dia é uma visão deles
+    segmento = destino / f"segmento_{n}"
+    medir(resultados, f"compacto.salvar[{n}]", compacto.salvar, compacto.de_arrays(instantes, valores), segmento)
+    serie = medir(resultados, f"compacto.abrir[{n}]", compacto.abrir, segmento)
+    medir(resultados, f"compacto.janela[{n}]", serie.janela, int(instantes[0]), int(instantes[0]) + compacto.DIA_MS)
+
+    consulta = medir(resultados, f"serie.consulta[{n}]", serie_temporal.consultar, "Bench", f"N{n}", caminho=banco)
+    bruto = serie_temporal.consultar("Bench", f"N{n}", resolucao=None, caminho=banco)
+    medir(resultados, f"amostragem.reduzir[{n}]", amostragem.reduzir_df, bruto, "Timestamp", "Download (Mbps)")
+    medir(resultados, f"anomalias.detectar[{n}]", anomalias.detectar, instantes, valores)
+    medir(resultados, f"estatisticas.calcular[{n}]", estatisticas.calcular, bruto["Timestamp"].to_numpy(), bruto["Download (Mbps)"].to_numpy())
+
+    figura = medir(resultados, f"figura.construcao[{n}]", graficos.grafico_download, consulta, "Bench", 150.0)
+    resultados[f"figura.construcao[{n}]"]["bytes"] = len(figura.to_json())
+    return banco
+
+
+def bench_pag1(resultados, destino, n, banco):
+    with open(destino / "conjuntos.json", "w", encoding="utf-8") as arquivo:
+        json.dump([{
+            "id": f"bench-{n}", "site": "Bench", "rede": f"N{n}", "titulo": f"{n} amostras",
+            "periodo": "sintético", "arquivo": str(banco),
+        }], arquivo)
+
+    app = medir(resultados, f"pag1.render.frio[{n}]", rodar_app, destino)
+    resultados[f"pag1.render.frio[{n}]"]["bytes"] = bytes_da_arvore(app._tree)
+    medir(resultados, f"pag1.render.quente[{n}]", app.run)
+    resultados[f"pag1.render.quente[{n}]"]["bytes"] = bytes_da_arvore(app._tree)
+
+
+def bench_pag2(resultados, destino, quantidade):
+    gerar_imagens(destino, quantidade)
+
+    def abrir_equipamentos(app):
+        [r for r in app.radio if r.label.startswith("Navegue")][0].set_value("Equipamentos").run()
+        app.selectbox[0].set_value("Sintético").run()
+
+    app = medir(resultados, f"pag2.render.frio[{quantidade}img]", rodar_app, destino, abrir_equipamentos)
+    resultados[f"pag2.render.frio[{quantidade}img]"]["bytes"] = bytes_da_arvore(app._tree) + bytes_das_imagens(app, destino)
+    medir(resultados, f"pag2.render.quente[{quantidade}img]", app.run)
+    resultados[f"pag2.render.quente[{quantidade}img]"]["bytes"] = bytes_da_arvore(app._tree) + bytes_das_imagens(app, destino)
+
+
+def comparar(resultados, baseline, tolerancia):
+    regressoes = []
+    for caso, medidas in resultados.items():
+        referencia = baseline.get(caso)
+        if not referencia:
+            continue
+        for metrica, valor in medidas.items():
+            base = referencia.get(metrica)
+            # Abaixo de 5 ms / 1 MB / 1 KB o ruído domina a comparação
+            piso = {"segundos": 0.005, "pico_mb": 1.0, "bytes": 1024}[metrica]
+            if base is None or max(base, valor) < piso:
+                continue
+            if valor > max(base, piso) * (1 + tolerancia[metrica]):
+                regressoes.append(f"{caso} {metrica}: {valor} (referência {base})")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das páginas do relatório em modo headless")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                        help="linhas das séries sintéticas (ex.: 1000 10000 10000000)")
+    parser.add_argument("--imagens", type=int, nargs="+", default=list(IMAGENS_PADRAO))
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--atualizar-baseline", action="store_true")
+    parser.add_argument("--tolerancia-tempo", type=float, default=TOLERANCIA_PADRAO["segundos"])
+    parser.add_argument("--saida", type=Path, help="grava os resultados em JSON")
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    origem = Path.cwd()
+    with tempfile.TemporaryDirectory(prefix="bench_relatorio_") as temporario:
+        destino = Path(temporario)
+        preparar_ambiente(destino)
+        os.chdir(destino)
+        sys.path.insert(0, str(destino))
+        try:
+            # O primeiro px.line carrega templates e validadores do plotly; fica fora da medição
+            import pandas as pd
+            import graficos
+            graficos.grafico_download(pd.DataFrame({'Timestamp': pd.to_datetime([0, 1]), 'Download (Mbps)': [1.0, 2.0]}), "", 1.5)
+
+            for n in sorted(args.tamanhos):
+                banco = bench_dados(resultados, destino, n)
+                bench_pag1(resultados, destino, n, banco)
+            for quantidade in sorted(args.imagens):
+                bench_pag2(resultados, destino, quantidade)
+        finally:
+            os.chdir(origem)
+
+    for caso, medidas in resultados.items():
+        extra = f"  {medidas['bytes'] / 1024:10.1f} KB" if "bytes" in medidas else ""
+        print(f"{caso:40s} {medidas['segundos'] * 1000:10.1f} ms  {medidas['pico_mb']:8.1f} MB{extra}")
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.atualizar_baseline:
+        args.baseline.write_text(json.dumps(resultados, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"Referência atualizada em '{args.baseline}'.")
+        return 0
+
+    if not args.baseline.exists():
+        print("Sem referência para comparar; rode com --atualizar-baseline para criar uma.")
+        return 0
+
+    tolerancia = {**TOLERANCIA_PADRAO, "segundos": args.tolerancia_tempo}
+    regressoes = comparar(resultados, json.loads(args.baseline.read_text(encoding="utf-8")), tolerancia)
+    for regressao in regressoes:
+        print(f"REGRESSÃO: {regressao}")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+import amostragem  # noqa: E402
+import anomalias  # noqa: E402
+import sondas  # noqa: E402
+
+
+# Propriedades que as otimizações prometem e que uma refatoração pode quebrar sem mudar
+# nenhum número dos benchmarks: sai com 1 na primeira divergência, como bench_render
+
+
+def serie_sintetica(aleatorio, n):
+    # Patamar que muda, quedas bruscas, falhas de medição (NaN) e períodos sem conexão
+    instantes = 1_740_000_000_000 + np.cumsum(aleatorio.integers(500, 1500, n))
+    valores = np.where(np.arange(n) < n // 2, 180.0, 90.0) + aleatorio.normal(0, 8, n)
+    valores[aleatorio.random(n) < 0.01] *= 0.2
+    valores[aleatorio.random(n) < 0.005] = np.nan
+    for inicio in aleatorio.integers(0, n - 50, 3):
+        valores[inicio:inicio + aleatorio.integers(5, 50)] = 0.0
+    return instantes, valores
+
+
+def _iguais(a, b):
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_iguais(a[k], b[k]) for k in a)
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(_iguais(x, y) for x, y in zip(a, b))
+    a, b = np.asarray(a), np.asarray(b)
+    if a.shape != b.shape:
+        return False
+    if np.issubdtype(a.dtype, np.floating):
+        return np.allclose(a, b, rtol=1e-9, atol=1e-9, equal_nan=True)
+    return np.array_equal(a, b)
+
+
+def verificar_anomalias(aleatorio, rodadas):
+    # O detector em lotes de qualquer tamanho dá o mesmo resultado que uma passada só
+    falhas = []
+    for rodada in range(rodadas):
+        instantes, valores = serie_sintetica(aleatorio, int(aleatorio.integers(200, 20_000)))
+        referencia = anomalias.detectar(instantes, valores)
+
+        cortes = np.sort(aleatorio.choice(np.arange(1, len(valores)), size=int(aleatorio.integers(1, 40)), replace=False))
+        detector = anomalias.DetectorIncremental()
+        for inicio, fim in zip(np.concatenate(([0], cortes)), np.concatenate((cortes, [len(valores)]))):
+            detector.incorporar(instantes[inicio:fim], valores[inicio:fim])
+            # resultado() no meio do caminho avalia a janela incompleta sem alterar o estado
+            detector.resultado()
+        obtido = detector.resultado()
+
+        for campo in anomalias.Anomalias.__dataclass_fields__:
+            if not _iguais(getattr(referencia, campo), getattr(obtido, campo)):
+                falhas.append(f"anomalias: '{campo}' difere em lotes ({len(valores)} amostras, {len(cortes) + 1} lotes, rodada {rodada})")
+    return falhas
+
+
+def _lttb_referencia(x, y, n_saida):
+    # Laço direto da mesma variante de amostragem.lttb (vértice A = média do balde anterior)
+    xf, yf = amostragem._como_float(x), np.asarray(y, dtype="float64")
+    inicio, fim, _ = amostragem._baldes(len(xf), n_saida - 2)
+    medias = [(xf[a:b].mean(), yf[a:b].mean()) for a, b in zip(inicio, fim)]
+    escolhidos = [0]
+    for i, (a, b) in enumerate(zip(inicio, fim)):
+        ax, ay = (xf[0], yf[0]) if i == 0 else medias[i - 1]
+        cx, cy = (xf[-1], yf[-1]) if i == len(medias) - 1 else medias[i + 1]
+        area = np.abs((ax - cx) * (yf[a:b] - ay) - (ax - xf[a:b]) * (cy - ay))
+        escolhidos.append(a + int(np.argmax(area)))
+    return np.array(escolhidos + [len(xf) - 1])
+
+
+def verificar_amostragem(aleatorio, rodadas):
+    falhas = []
+    for rodada in range(rodadas):
+        n = int(aleatorio.integers(10, 50_000))
+        n_saida = int(aleatorio.integers(4, 3000))
+        x = np.sort(aleatorio.integers(0, 10**12, n)).astype("datetime64[ms]")
+        y = aleatorio.normal(100, 30, n)
+        y[aleatorio.integers(0, n, 5)] = aleatorio.choice([0.0, 500.0], 5)
+
+        for metodo in ("lttb", "minmax", "minmax-lttb"):
+            indices = amostragem.reduzir(x, y, n_saida, metodo)
+            rotulo = f"amostragem.{metodo} (n={n}, saída={n_saida}, rodada {rodada})"
+            if len(indices) > max(n_saida, 0) and n > n_saida:
+                falhas.append(f"{rotulo}: {len(indices)} pontos, acima do limite")
+            if len(indices) and (indices[0] != 0 or indices[-1] != n - 1):
+                falhas.append(f"{rotulo}: não mantém o primeiro e o último ponto")
+            if np.any(np.diff(indices) <= 0):
+                falhas.append(f"{rotulo}: índices fora de ordem ou repetidos")
+
+        if n > n_saida:
+            indices = amostragem.minmax(x, y, n_saida)
+            if y.argmin() not in indices or y.argmax() not in indices:
+                falhas.append(f"amostragem.minmax (n={n}, saída={n_saida}): perdeu o mínimo ou o máximo global")
+            if n_saida >= 3 and not np.array_equal(amostragem.lttb(x, y, n_saida), _lttb_referencia(x, y, n_saida)):
+                falhas.append(f"amostragem.lttb (n={n}, saída={n_saida}): difere do laço de referência")
+    return falhas
+
+
+async def _ler(bruto, limite=7):
+    # Entrega a resposta em pedaços pequenos, como chegaria pela rede
+    leitor = asyncio.StreamReader()
+    for inicio in range(0, len(bruto), limite):
+        leitor.feed_data(bruto[inicio:inicio + limite])
+    leitor.feed_eof()
+    return await sondas._ler_resposta(leitor)
+
+
+async def _verificar_respostas():
+    falhas = []
+    corpo = bytes(range(256)) * 40
+    pedacos = b"".join(f"{len(p):x};ext=1\r\n".encode() + p + b"\r\n" for p in (corpo[:1000], corpo[1000:7777], corpo[7777:]))
+    casos = {
+        "content-length": (b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(corpo) + corpo, (200, len(corpo), True)),
+        "chunked": (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n" + pedacos + b"0\r\nX-Fim: 1\r\n\r\n", (200, len(corpo), True)),
+        "até fechar": (b"HTTP/1.0 200 OK\r\nConnection: close\r\n\r\n" + corpo, (200, len(corpo), False)),
+        "204": (b"HTTP/1.1 204 No Content\r\n\r\n", (204, 0, True)),
+    }
+    for nome, (bruto, esperado) in casos.items():
+        try:
+            obtido = await _ler(bruto)
+        except Exception as erro:
+            obtido = repr(erro)
+        if obtido != esperado:
+            falhas.append(f"sondas._ler_resposta ({nome}): {obtido}, esperado {esperado}")
+
+    for bruto in (b"BAD\r\n", b"HTTP/1.1\r\n\r\n", b"HTTP/1.1 abc OK\r\n\r\n"):
+        try:
+            await _ler(bruto)
+            falhas.append(f"sondas._ler_resposta aceitou {bruto!r}")
+        except ValueError:
+            pass
+        except Exception as erro:
+            falhas.append(f"sondas._ler_resposta({bruto!r}) levantou {type(erro).__name__} em vez de ValueError")
+
+    # Pelo pool contra o servidor local: bytes corretos e conexões reaproveitadas
+    servidor = await sondas.ServidorLocal().iniciar()
+    conexoes = sondas.ConexoesHTTP(max_por_host=2)
+    try:
+        resultados = await asyncio.gather(*(
+            conexoes.requisitar("GET", f"http://{servidor.endereco}/bytes/{tamanho}")
+            for tamanho in (0, 1, 65_536, 100_000) * 5
+        ))
+        recebidos = [recebido for _, recebido, _ in resultados]
+        if recebidos != [0, 1, 65_536, 100_000] * 5:
+            falhas.append(f"sondas.ConexoesHTTP: bytes recebidos {recebidos}")
+        if conexoes.abertas > 2:
+            falhas.append(f"sondas.ConexoesHTTP: {conexoes.abertas} conexões abertas para 20 requisições (máximo 2)")
+    finally:
+        await conexoes.fechar()
+        await servidor.fechar()
+    return falhas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica as invariantes das otimizações (lotes, amostragem, HTTP)")
+    parser.add_argument("--rodadas", type=int, default=20)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    aleatorio = np.random.default_rng(args.semente)
+    verificacoes = {
+        "anomalias em lotes": lambda: verificar_anomalias(aleatorio, args.rodadas),
+        "amostragem": lambda: verificar_amostragem(aleatorio, args.rodadas),
+        "respostas HTTP": lambda: asyncio.run(_verificar_respostas()),
+    }
+    falhas = []
+    for nome, verificar in verificacoes.items():
+        encontradas = verificar()
+        print(f"{nome:20s} {'ok' if not encontradas else f'{len(encontradas)} falhas'}")
+        falhas += encontradas
+
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from serie_temporal import EPOCA, agora_ms, preparar
+
+
+BANCO_PADRAO = "amostras.sqlite"
+# Mesmos nomes de site e rede do registro (conjuntos.json), para o banco aparecer no painel
+SITE_PADRAO = "Pousada"
+REDE_PADRAO = "Rede Nova"
+
+
+@dataclass
+class Amostra:
+    instante_ms: int
+    site: str
+    rede: str
+    alvo: str
+    download_mbps: float | None
+
+
+class ArmazemSQLite:
+    # Só faz INSERT: cada lote é uma transação curta, o arquivo nunca é reescrito
+    def __init__(self, caminho=BANCO_PADRAO):
+        self.caminho = caminho
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        preparar(self._conexao)
+        self._trava = threading.Lock()
+
+    def anexar(self, amostras):
+        linhas = [(a.instante_ms, a.site, a.rede, a.alvo, a.download_mbps) for a in amostras]
+        with self._trava, self._conexao:
+            self._conexao.executemany(
+                "INSERT INTO amostras (instante_ms, site, rede, alvo, download_mbps) VALUES (?, ?, ?, ?, ?)",
+                linhas,
+            )
+        return len(linhas)
+
+    def anexar_sondagens(self, sondagens):
+        linhas = [(s.instante_ms, s.site, s.rede, s.tipo, s.alvo, s.rotulo, s.valor, s.erro) for s in sondagens]
+        with self._trava, self._conexao:
+            self._conexao.executemany(
+                "INSERT INTO sondagens (instante_ms, site, rede, tipo, alvo, rotulo, valor, erro) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                linhas,
+            )
+        return len(linhas)
+
+    def fechar(self):
+        self._conexao.close()
+
+
+class BackendSpeedtest:
+    # Cada alvo é o id de um servidor speedtest.net, ou "auto" para o melhor servidor
+    def __init__(self):
+        self._clientes = {}
+
+    def _cliente(self, alvo):
+        import speedtest
+
+        if alvo not in self._clientes:
+            cliente = speedtest.Speedtest()
+            if alvo != "auto":
+                cliente.get_servers([int(alvo)])
+            cliente.get_best_server()
+            self._clientes[alvo] = cliente
+        return self._clientes[alvo]
+
+    def _medir(self, alvo):
+        return self._cliente(alvo).download() / 1_000_000
+
+    async def medir(self, alvo):
+        return await asyncio.to_thread(self._medir, alvo)
+
+
+class BackendLocal:
+    # Substituto offline: devolve velocidades sintéticas em torno de uma média por alvo
+    def __init__(self, medias=None, atraso=0.0, semente=None):
+        self.medias = medias or {}
+        self.atraso = atraso
+        self._aleatorio = random.Random(semente)
+
+    async def medir(self, alvo):
+        if self.atraso:
+            await asyncio.sleep(self.atraso)
+        media = self.medias.get(alvo, 100.0)
+        return max(0.0, self._aleatorio.gauss(media, media * 0.1))
+
+
+class Coletor:
+    def __init__(self, backend, armazem, alvos, site, rede, intervalo=60.0,
+                 tamanho_lote=50, intervalo_gravacao=30.0, max_simultaneos=4):
+        self.backend = backend
+        self.armazem = armazem
+        self.alvos = list(alvos)
+        self.site = site
+        self.rede = rede
+        self.intervalo = intervalo
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_gravacao = intervalo_gravacao
+        self._semaforo = asyncio.Semaphore(max_simultaneos)
+        self._pendentes = []
+        self._ultima_gravacao = time.monotonic()
+        self.gravadas = 0
+
+    async def _medir(self, alvo):
+        async with self._semaforo:
+            try:
+                download = await self.backend.medir(alvo)
+            except Exception as erro:
+                print(f"Falha no teste para '{alvo}': {erro}")
+                download = None
+        return Amostra(agora_ms(), self.site, self.rede, alvo, download)
+
+    async def _gravar(self):
+        if not self._pendentes:
+            return
+        lote, self._pendentes = self._pendentes, []
+        self.gravadas += await asyncio.to_thread(self.armazem.anexar, lote)
+        self._ultima_gravacao = time.monotonic()
+
+    async def rodada(self):
+        amostras = await asyncio.gather(*(self._medir(alvo) for alvo in self.alvos))
+        for amostra in amostras:
+            instante = (EPOCA + timedelta(milliseconds=amostra.instante_ms)).strftime("%Y-%m-%d %H:%M:%S")
+            valor = "falhou" if amostra.download_mbps is None else f"{amostra.download_mbps:.2f} Mbps"
+            print(f"Teste realizado: {instante} - {amostra.alvo} - Download: {valor}")
+        self._pendentes.extend(amostras)
+        if (len(self._pendentes) >= self.tamanho_lote
+                or time.monotonic() - self._ultima_gravacao >= self.intervalo_gravacao):
+            await self._gravar()
+
+    async def executar(self, rodadas=None):
+        # Agenda pelo relógio do loop para não acumular atraso entre rodadas
+        loop = asyncio.get_running_loop()
+        proxima = loop.time()
+        feitas = 0
+        try:
+            while rodadas is None or feitas < rodadas:
+                await self.rodada()
+                feitas += 1
+                if rodadas is not None and feitas >= rodadas:
+                    break
+                proxima += self.intervalo
+                espera = proxima - loop.time()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+                else:
+                    proxima = loop.time()
+        finally:
+            await self._gravar()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coleta contínua de testes de velocidade")
+    parser.add_argument("--banco", default=BANCO_PADRAO)
+    parser.add_argument("--site", default=SITE_PADRAO)
+    parser.add_argument("--rede", default=REDE_PADRAO)
+    parser.add_argument("--alvo", action="append", dest="alvos",
+                        help="id do servidor speedtest.net (pode repetir); padrão: auto")
+    parser.add_argument("--intervalo", type=float, default=60.0, help="segundos entre rodadas")
+    parser.add_argument("--rodadas", type=int, default=None, help="padrão: roda até ser interrompido")
+    parser.add_argument("--lote", type=int, default=50, help="amostras por gravação")
+    parser.add_argument("--gravar-a-cada", type=float, default=30.0, help="segundos máximos entre gravações")
+    parser.add_argument("--simultaneos", type=int, default=4)
+    parser.add_argument("--local", action="store_true", help="usa o backend local, sem acesso à internet")
+    args = parser.parse_args(argv)
+
+    backend = BackendLocal() if args.local else BackendSpeedtest()
+    armazem = ArmazemSQLite(args.banco)
+    coletor = Coletor(
+        backend, armazem, args.alvos or ["auto"], args.site, args.rede,
+        intervalo=args.intervalo, tamanho_lote=args.lote,
+        intervalo_gravacao=args.gravar_a_cada, max_simultaneos=args.simultaneos,
+    )
+
+    print("Iniciando os testes de velocidade...")
+    try:
+        asyncio.run(coletor.executar(args.rodadas))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        armazem.fechar()
+    print(f"Coleta encerrada! {coletor.gravadas} amostras salvas em '{args.banco}'.")
+
+
+if __name__ == "__main__":
+    main()
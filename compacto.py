@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+
+
+DIA_MS = 86_400_000
+TIPOS = {"instantes_ms": "int64", "valores": "float32", "site": "int16", "rede": "int16"}
+
+
+@dataclass(frozen=True, eq=False)
+class SerieCompacta:
+    # Uma amostra ocupa 16 bytes em quatro vetores contíguos, contra ~67 bytes por linha no
+    # DataFrame do coletor (site, rede e alvo em texto e "hora"). Instantes em ms do horário
+    # local desde 1970, como em serie_temporal, em ordem crescente; site e rede são códigos
+    # em `sites` e `redes`.
+    # Os vetores são compartilhados entre reruns e sessões (e podem ser mapas de arquivo
+    # somente leitura): não altere no lugar
+    instantes_ms: np.ndarray
+    valores: np.ndarray
+    site: np.ndarray
+    rede: np.ndarray
+    sites: tuple = ("",)
+    redes: tuple = ("",)
+
+    def __len__(self):
+        return len(self.instantes_ms)
+
+    def __getitem__(self, fatia):
+        # Só fatias simples: o resultado são visões dos mesmos vetores, sem cópia
+        if not isinstance(fatia, slice) or fatia.step not in (None, 1):
+            raise TypeError("SerieCompacta aceita apenas fatias contíguas")
+        return replace(self, instantes_ms=self.instantes_ms[fatia], valores=self.valores[fatia],
+                       site=self.site[fatia], rede=self.rede[fatia])
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, coluna).nbytes for coluna in TIPOS)
+
+    def janela(self, inicio_ms=None, fim_ms=None):
+        # Busca binária nos instantes ordenados; devolve visões, como __getitem__
+        a = 0 if inicio_ms is None else int(np.searchsorted(self.instantes_ms, inicio_ms, side="left"))
+        b = len(self) if fim_ms is None else int(np.searchsorted(self.instantes_ms, fim_ms, side="right"))
+        return self[a:b]
+
+    def da_rede(self, site, rede):
+        if site not in self.sites or rede not in self.redes:
+            return self[0:0]
+        mascara = (self.site == self.sites.index(site)) & (self.rede == self.redes.index(rede))
+        if mascara.all():
+            return self
+        return replace(self, instantes_ms=self.instantes_ms[mascara], valores=self.valores[mascara],
+                       site=self.site[mascara], rede=self.rede[mascara])
+
+    def rotular(self, site, rede):
+        # Série de uma rede só (planilhas não dizem de onde vieram): troca só as categorias
+        return replace(self, sites=(site,), redes=(rede,))
+
+    def datas(self):
+        # Visão dos instantes como datetime64, sem cópia: serve direto ao plotly e ao numpy
+        return self.instantes_ms.view("datetime64[ms]")
+
+    def horarios(self):
+        # Horário do dia sobre 1970-01-01, para sobrepor dias diferentes no mesmo eixo
+        return (self.instantes_ms % DIA_MS).view("datetime64[ms]")
+
+    def media(self):
+        validos = self.valores[~np.isnan(self.valores)]
+        return float(validos.mean(dtype="float64")) if len(validos) else float("nan")
+
+    def tabela(self):
+        # DataFrame para quem ainda precisa de um (exportações, ingestão)
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Timestamp": self.datas().astype("datetime64[ns]"),
+            "Download (Mbps)": self.valores.astype("float64"),
+        })
+
+
+def de_arrays(instantes_ms, valores, site="", rede=""):
+    instantes_ms = np.asarray(instantes_ms, dtype=TIPOS["instantes_ms"])
+    valores = np.asarray(valores, dtype=TIPOS["valores"])
+    if len(instantes_ms) > 1 and (np.diff(instantes_ms) < 0).any():
+        ordem = np.argsort(instantes_ms, kind="stable")
+        instantes_ms, valores = instantes_ms[ordem], valores[ordem]
+    zeros = np.zeros(len(instantes_ms), dtype=TIPOS["site"])
+    return SerieCompacta(instantes_ms, valores, zeros, zeros, (site,), (rede,))
+
+
+def de_dataframe(df, site="", rede=""):
+    # Espera a saída de ingestao.normalizar: "Timestamp" completo e "Download (Mbps)"
+    instantes = df["Timestamp"].to_numpy().astype("datetime64[ms]").view("int64")
+    return de_arrays(instantes, df["Download (Mbps)"].to_numpy(), site, rede)
+
+
+def concatenar(series):
+    # Une as categorias de todas as séries e reordena pelo instante (ordenação estável)
+    series = [s for s in series if len(s)]
+    if not series:
+        return de_arrays([], [])
+    sites = tuple(dict.fromkeys(c for s in series for c in s.sites))
+    redes = tuple(dict.fromkeys(c for s in series for c in s.redes))
+    colunas = {
+        "instantes_ms": np.concatenate([s.instantes_ms for s in series]),
+        "valores": np.concatenate([s.valores for s in series]),
+        "site": np.concatenate([np.array([sites.index(c) for c in s.sites], TIPOS["site"])[s.site] for s in series]),
+        "rede": np.concatenate([np.array([redes.index(c) for c in s.redes], TIPOS["rede"])[s.rede] for s in series]),
+    }
+    ordem = np.argsort(colunas["instantes_ms"], kind="stable")
+    return SerieCompacta(**{nome: vetor[ordem] for nome, vetor in colunas.items()}, sites=sites, redes=redes)
+
+
+class Acumulador:
+    # Série de uma rede que cresce pelo fim (banco do coletor, só INSERTs): a capacidade dobra
+    # quando enche, então anexar custa O(amostras novas) amortizado. As séries devolvidas são
+    # visões do trecho já escrito, que nunca muda; só um lote fora de ordem refaz tudo
+    def __init__(self, site="", rede=""):
+        self.sites, self.redes = (site,), (rede,)
+        self.tamanho = 0
+        self._instantes = np.empty(0, dtype=TIPOS["instantes_ms"])
+        self._valores = np.empty(0, dtype=TIPOS["valores"])
+        self._codigos = np.zeros(0, dtype=TIPOS["site"])
+
+    def _reservar(self, capacidade):
+        instantes = np.empty(capacidade, dtype=TIPOS["instantes_ms"])
+        valores = np.empty(capacidade, dtype=TIPOS["valores"])
+        instantes[:self.tamanho] = self._instantes[:self.tamanho]
+        valores[:self.tamanho] = self._valores[:self.tamanho]
+        self._instantes, self._valores = instantes, valores
+        self._codigos = np.zeros(capacidade, dtype=TIPOS["site"])
+
+    def anexar(self, instantes_ms, valores):
+        novos = de_arrays(instantes_ms, valores, *self.sites, *self.redes)
+        if not len(novos):
+            return self.serie()
+        if self.tamanho and novos.instantes_ms[0] < self._instantes[self.tamanho - 1]:
+            todos = concatenar([self.serie(), novos])
+            self.tamanho = 0
+            self._reservar(2 * len(todos))
+            novos = todos
+        fim = self.tamanho + len(novos)
+        if fim > len(self._instantes):
+            self._reservar(max(2 * len(self._instantes), fim, 1024))
+        self._instantes[self.tamanho:fim] = novos.instantes_ms
+        self._valores[self.tamanho:fim] = novos.valores
+        self.tamanho = fim
+        return self.serie()
+
+    def serie(self):
+        codigos = self._codigos[:self.tamanho]
+        return SerieCompacta(self._instantes[:self.tamanho], self._valores[:self.tamanho], codigos, codigos,
+                             self.sites, self.redes)
+
+
+def salvar(serie, pasta):
+    # Um .npy por coluna e as categorias em JSON. Grava numa pasta temporária única (por
+    # processo e por thread) e a renomeia: leitores concorrentes veem o segmento inteiro ou nenhum
+    pasta = Path(pasta)
+    pasta.parent.mkdir(parents=True, exist_ok=True)
+    temporaria = Path(tempfile.mkdtemp(prefix=f"{pasta.name}.", suffix=".tmp", dir=pasta.parent))
+    for coluna, tipo in TIPOS.items():
+        np.save(temporaria / f"{coluna}.npy", np.ascontiguousarray(getattr(serie, coluna), dtype=tipo))
+    (temporaria / "categorias.json").write_text(
+        json.dumps({"sites": serie.sites, "redes": serie.redes}, ensure_ascii=False), encoding="utf-8"
+    )
+    try:
+        os.replace(temporaria, pasta)
+    except OSError:
+        # Outro gravador terminou o mesmo segmento primeiro
+        shutil.rmtree(temporaria, ignore_errors=True)
+
+
+def abrir(pasta, mapear=True):
+    # mapear=True devolve mapas somente leitura: as páginas do arquivo entram na memória
+    # sob demanda e são compartilhadas pelo cache do sistema entre processos
+    pasta = Path(pasta)
+    categorias = json.loads((pasta / "categorias.json").read_text(encoding="utf-8"))
+    colunas = {c: np.load(pasta / f"{c}.npy", mmap_mode="r" if mapear else None) for c in TIPOS}
+    return SerieCompacta(**colunas, sites=tuple(categorias["sites"]), redes=tuple(categorias["redes"]))
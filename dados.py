@@ -0,0 +1,115 @@
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+import compacto
+import diagnostico
+
+
+# Planilhas convertidas em segmentos compactos (compacto.salvar) ficam aqui, um por versão
+# do arquivo de origem. Mapeados, só as páginas lidas ocupam memória
+PASTA_CACHE = Path(".cache") / "dados"
+MAPEAR_SEGMENTOS = True
+MAX_EM_MEMORIA = 32
+
+_memoria = OrderedDict()
+_trava = threading.Lock()
+_gerando = {}
+
+
+def versao(caminho):
+    # Identifica o conteúdo do arquivo sem precisar abri-lo: caminho + mtime + tamanho
+    info = os.stat(caminho)
+    return (str(Path(caminho).resolve()), info.st_mtime_ns, info.st_size)
+
+
+def ler_planilha(caminho):
+    df = pd.read_excel(caminho)
+    if 'hora' in df.columns:
+        df['hora'] = pd.to_datetime(df['hora'].astype(str), format='%H:%M:%S')
+    df['Download (Mbps)'] = df['Download (Mbps)'].astype('float64')
+    return df
+
+
+def _prefixo_cache(origem):
+    # Arquivos com o mesmo nome em pastas diferentes não podem compartilhar cache
+    return f"{Path(origem).stem}-{hashlib.sha1(origem.encode()).hexdigest()[:8]}"
+
+
+def _pasta_cache(chave):
+    origem, mtime, tamanho = chave
+    resumo = hashlib.sha1(f"{mtime}|{tamanho}".encode()).hexdigest()[:8]
+    return PASTA_CACHE / f"{_prefixo_cache(origem)}-{resumo}"
+
+
+def _remover_versoes_antigas(chave, atual):
+    for antigo in PASTA_CACHE.glob(f"{_prefixo_cache(chave[0])}-*"):
+        if antigo != atual:
+            # No Windows um segmento ainda mapeado por outro processo não pode ser apagado;
+            # fica para a próxima troca de versão
+            shutil.rmtree(antigo, ignore_errors=True)
+
+
+def ler_colunar(caminho, chave=None):
+    # Lê o segmento compacto da versão atual da planilha, gerando-o se necessário. Sessões
+    # do mesmo processo que pedem a mesma planilha fria esperam uma única geração; entre
+    # processos, cada um grava numa pasta temporária própria e a renomeia
+    from ingestao import normalizar
+
+    chave = chave or versao(caminho)
+    segmento = _pasta_cache(chave)
+    existe = segmento.exists()
+    diagnostico.cache("dados.segmentos", existe)
+    if not existe:
+        with _trava:
+            trava_chave = _gerando.setdefault(chave, threading.Lock())
+        try:
+            with trava_chave:
+                if not segmento.exists():
+                    serie = _gerar_segmento(caminho, chave, segmento, normalizar)
+                    if not segmento.exists():
+                        return serie
+        finally:
+            with _trava:
+                _gerando.pop(chave, None)
+
+    with diagnostico.trecho("dados.abrir_segmento", arquivo=Path(caminho).name) as info:
+        serie = compacto.abrir(segmento, mapear=MAPEAR_SEGMENTOS)
+        info["linhas"] = len(serie)
+    return serie
+
+
+def _gerar_segmento(caminho, chave, segmento, normalizar):
+    with diagnostico.trecho("dados.ler_planilha", arquivo=Path(caminho).name) as info:
+        serie = compacto.de_dataframe(normalizar(ler_planilha(caminho), Path(caminho).name))
+        info["linhas"] = len(serie)
+    PASTA_CACHE.mkdir(parents=True, exist_ok=True)
+    compacto.salvar(serie, segmento)
+    _remover_versoes_antigas(chave, segmento)
+    return serie
+
+
+def carregar(caminho):
+    # A série devolvida é compartilhada entre reruns e sessões: não altere no lugar
+    chave = versao(caminho)
+    with _trava:
+        diagnostico.cache("dados.memoria", chave in _memoria)
+        if chave in _memoria:
+            _memoria.move_to_end(chave)
+            return _memoria[chave]
+
+    serie = ler_colunar(caminho, chave)
+
+    with _trava:
+        for antiga in [c for c in _memoria if c[0] == chave[0] and c != chave]:
+            del _memoria[antiga]
+        _memoria[chave] = serie
+        _memoria.move_to_end(chave)
+        while len(_memoria) > MAX_EM_MEMORIA:
+            _memoria.popitem(last=False)
+    return serie
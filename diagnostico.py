@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+
+
+MAX_RERUNS = 500
+
+# Cada rerun do Streamlit roda numa thread própria: o ContextVar isola as medições de
+# sessões simultâneas. Fora de um rerun (CLI, benchmarks) as medições são descartadas
+_atual = ContextVar("diagnostico_rerun", default=None)
+_historico = deque(maxlen=MAX_RERUNS)
+_trava = threading.Lock()
+
+
+@dataclass
+class Trecho:
+    nome: str
+    inicio_ms: float
+    duracao_ms: float
+    atributos: dict
+
+
+@dataclass
+class Rerun:
+    sessao: str
+    pagina: str
+    instante: float
+    duracao_ms: float = 0.0
+    trechos: list = field(default_factory=list)
+    cache: dict = field(default_factory=dict)
+
+    def linha_json(self):
+        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+
+
+@contextmanager
+def rerun(sessao, pagina):
+    registro = Rerun(sessao, pagina, time.time())
+    registro.origem = time.perf_counter()
+    token = _atual.set(registro)
+    try:
+        yield registro
+    finally:
+        registro.duracao_ms = (time.perf_counter() - registro.origem) * 1000
+        _atual.reset(token)
+        with _trava:
+            _historico.append(registro)
+
+
+@contextmanager
+def trecho(nome, **atributos):
+    # O dicionário devolvido aceita atributos descobertos durante o trecho (linhas, bytes...)
+    registro = _atual.get()
+    if registro is None:
+        yield atributos
+        return
+    inicio = time.perf_counter()
+    try:
+        yield atributos
+    finally:
+        fim = time.perf_counter()
+        registro.trechos.append(Trecho(nome, (inicio - registro.origem) * 1000, (fim - inicio) * 1000, atributos))
+
+
+def cache(nome, acerto):
+    registro = _atual.get()
+    if registro is None:
+        return
+    acertos, falhas = registro.cache.get(nome, (0, 0))
+    registro.cache[nome] = (acertos + 1, falhas) if acerto else (acertos, falhas + 1)
+
+
+def historico():
+    with _trava:
+        return list(_historico)
+
+
+def exportar_jsonl(reruns=None):
+    return "".join(r.linha_json() + "\n" for r in (historico() if reruns is None else reruns))
+
+
+def limpar():
+    with _trava:
+        _historico.clear()
+
@@ -0,0 +1,126 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from registro import carregar, versao
+from textos import VELOCIDADES_RECOMENDADAS
+
+
+JANELA_ESTABILIDADE = 10
+LIMITE_QUEDA_MBPS = 1.0
+
+
+def limiares_recomendados():
+    # "15 - 25" vira 25: o limiar é o topo da faixa recomendada para o uso
+    limiares = {}
+    for uso, faixa in zip(VELOCIDADES_RECOMENDADAS["Uso"], VELOCIDADES_RECOMENDADAS["Velocidade Recomendada (Mbps)"]):
+        limiares[uso] = max(float(v) for v in re.findall(r"\d+(?:[.,]\d+)?", faixa.replace(",", ".")))
+    return limiares
+
+
+@dataclass(frozen=True)
+class Estatisticas:
+    amostras: int
+    falhas: int
+    media: float
+    desvio: float
+    minimo: float
+    maximo: float
+    p5: float
+    p50: float
+    p95: float
+    jitter: float
+    variacao_janela: float
+    pior_variacao_janela: float
+    duracao_s: float
+    abaixo: dict
+    quedas: int
+    maior_queda_s: float
+    tempo_em_queda_s: float
+
+
+def _duracoes(instantes_s):
+    # Cada amostra vale até a próxima; a última recebe o intervalo típico da série
+    if len(instantes_s) < 2:
+        return np.ones(len(instantes_s))
+    passos = np.diff(instantes_s)
+    return np.append(passos, np.median(passos)).clip(min=0)
+
+
+def _variacao_movel(valores, janela):
+    # Coeficiente de variação em janelas deslizantes via somas acumuladas, O(n)
+    janela = max(1, min(janela, len(valores)))
+    soma = np.concatenate(([0.0], np.cumsum(valores)))
+    soma2 = np.concatenate(([0.0], np.cumsum(valores * valores)))
+    media = (soma[janela:] - soma[:-janela]) / janela
+    variancia = np.maximum((soma2[janela:] - soma2[:-janela]) / janela - media * media, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cv = np.sqrt(variancia) / media
+    return np.where(media > 0, cv, 0.0)
+
+
+def sequencias(mascara):
+    # Pares (início, fim) das sequências de True, fim exclusivo
+    bordas = np.diff(np.concatenate(([0], mascara.view(np.int8), [0])))
+    return np.flatnonzero(bordas == 1), np.flatnonzero(bordas == -1)
+
+
+def calcular(instantes, valores, limiares=None, janela=JANELA_ESTABILIDADE, limite_queda=LIMITE_QUEDA_MBPS):
+    instantes_s = np.asarray(instantes).astype("datetime64[ns]").view("int64") / 1e9
+    todos = np.asarray(valores, dtype="float64")
+    limiares = limiares_recomendados() if limiares is None else limiares
+
+    duracoes = _duracoes(instantes_s)
+    total = float(duracoes.sum())
+    validos = ~np.isnan(todos)
+    v = todos[validos]
+    if not len(v):
+        v = np.array([np.nan])
+
+    p5, p50, p95 = np.percentile(v, [5, 50, 95])
+    cv = _variacao_movel(v, janela)
+
+    # Falha de medição conta como queda: para o usuário, a conexão não estava lá
+    preenchidos = np.nan_to_num(todos)
+    em_queda = ~validos | (preenchidos < limite_queda)
+    inicios, fins = sequencias(em_queda)
+    soma_duracoes = np.concatenate(([0.0], np.cumsum(duracoes)))
+    duracao_quedas = soma_duracoes[fins] - soma_duracoes[inicios]
+
+    abaixo = {}
+    for uso, limiar in limiares.items():
+        tempo = float(duracoes[preenchidos < limiar].sum())
+        abaixo[uso] = (limiar, tempo, tempo / total if total else 0.0)
+
+    return Estatisticas(
+        amostras=int(len(todos)),
+        falhas=int((~validos).sum()),
+        media=float(np.mean(v)),
+        desvio=float(np.std(v)),
+        minimo=float(np.min(v)),
+        maximo=float(np.max(v)),
+        p5=float(p5),
+        p50=float(p50),
+        p95=float(p95),
+        jitter=float(np.mean(np.abs(np.diff(v)))) if len(v) > 1 else 0.0,
+        variacao_janela=float(np.mean(cv)),
+        pior_variacao_janela=float(np.max(cv)),
+        duracao_s=total,
+        abaixo=abaixo,
+        quedas=int(len(inicios)),
+        maior_queda_s=float(duracao_quedas.max()) if len(duracao_quedas) else 0.0,
+        tempo_em_queda_s=float(duracao_quedas.sum()),
+    )
+
+
+@lru_cache(maxsize=64)
+def _do_conjunto(conjunto, versao_conjunto):
+    serie = carregar(conjunto)
+    return calcular(serie.datas(), serie.valores)
+
+
+def do_conjunto(conjunto):
+    # Recalcula só quando a versão do conjunto muda (arquivo novo, linhas anexadas)
+    return _do_conjunto(conjunto, versao(conjunto))
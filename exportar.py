@@ -0,0 +1,255 @@
+import argparse
+import base64
+import re
+import time
+from html import escape
+from pathlib import Path
+
+import anomalias
+import graficos
+import incremental
+import serie_temporal
+from inventario import EM_USO, ESTOQUE, inventario
+from miniaturas import LARGURA_PADRAO, gerar as gerar_miniatura
+from registro import carregar as carregar_conjunto, registro
+from textos import INTRODUCAO, METODOLOGIA, NOTA_VELOCIDADES, TEXTOS, VELOCIDADES_RECOMENDADAS
+
+
+SAIDA_PADRAO = "relatorio.html"
+
+ESTILO = """
+body { font-family: system-ui, sans-serif; max-width: 60rem; margin: 2rem auto; padding: 0 1rem; color: #262730; }
+h1 { margin-top: 2.5rem; }
+table { border-collapse: collapse; margin: 1rem 0; }
+th, td { border: 1px solid #ddd; padding: 0.3rem 0.6rem; text-align: left; }
+.cartoes { display: flex; gap: 2rem; flex-wrap: wrap; margin: 1rem 0; }
+.cartoes div { min-width: 9rem; }
+.cartoes b { display: block; font-size: 1.4rem; }
+figure { margin: 0 0 1rem 0; break-inside: avoid; }
+figcaption { font-size: 0.875rem; opacity: 0.6; }
+.grafico { break-inside: avoid; }
+"""
+
+
+def _inline(texto):
+    texto = escape(texto)
+    texto = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", texto)
+    return re.sub(r"\*(.+?)\*", r"<em>\1</em>", texto)
+
+
+def _markdown_simples(texto):
+    # Só o que os textos do relatório usam: títulos, listas aninhadas, negrito, itálico e
+    # parágrafos. Usado quando o pacote opcional 'markdown' não está instalado
+    saida, niveis, paragrafo = [], [], []
+
+    def fechar_paragrafo():
+        if paragrafo:
+            saida.append(f"<p>{_inline(' '.join(paragrafo))}</p>")
+            paragrafo.clear()
+
+    def fechar_listas(ate=0):
+        while len(niveis) > ate:
+            saida.append("</li></ul>")
+            niveis.pop()
+
+    em_branco = False
+    for linha in texto.splitlines():
+        item = re.match(r"^(\s*)- (.*)$", linha)
+        titulo = re.match(r"^(#{1,6}) (.*)$", linha.strip())
+        if item:
+            fechar_paragrafo()
+            nivel = len(item.group(1).expandtabs(4)) // 4 + 1
+            if nivel > len(niveis):
+                saida.append("<ul><li>")
+                niveis.append(nivel)
+            else:
+                fechar_listas(nivel)
+                saida.append("</li><li>")
+            saida.append(_inline(item.group(2).strip()))
+        elif titulo:
+            fechar_paragrafo()
+            fechar_listas()
+            n = len(titulo.group(1))
+            saida.append(f"<h{n}>{_inline(titulo.group(2))}</h{n}>")
+        elif not linha.strip():
+            # Linha em branco não encerra a lista: só um parágrafo sem marcador depois dela
+            fechar_paragrafo()
+        elif niveis and not em_branco:
+            saida.append(" " + _inline(linha.strip()))
+        else:
+            fechar_listas()
+            paragrafo.append(linha.strip())
+        em_branco = not linha.strip()
+    fechar_paragrafo()
+    fechar_listas()
+    return "\n".join(saida)
+
+
+def markdown_html(texto):
+    try:
+        import markdown
+    except ImportError:
+        return _markdown_simples(texto)
+    return markdown.markdown(texto)
+
+
+def imagem_embutida(caminho, largura, formato):
+    # Miniatura já comprimida (a mesma que o painel serve), embutida como data URI
+    destino = gerar_miniatura(caminho, largura, 1, formato)
+    dados = base64.b64encode(Path(destino).read_bytes()).decode("ascii")
+    return f"data:image/{formato};base64,{dados}"
+
+
+def tabela_html(colunas, linhas):
+    cabecalho = "".join(f"<th>{escape(str(c))}</th>" for c in colunas)
+    corpo = "".join("<tr>" + "".join(f"<td>{escape(str(v))}</td>" for v in linha) + "</tr>" for linha in linhas)
+    return f"<table><thead><tr>{cabecalho}</tr></thead><tbody>{corpo}</tbody></table>"
+
+
+class Exportador:
+    # pdf=True troca os gráficos interativos por SVG estático (kaleido) e as miniaturas por JPEG
+    def __init__(self, pdf=False, plotlyjs="inline", largura_imagem=LARGURA_PADRAO, anomalias=True):
+        self.pdf = pdf
+        self.anomalias = anomalias
+        self.plotlyjs = plotlyjs
+        self.largura_imagem = largura_imagem
+        self._plotlyjs_incluido = False
+
+    def grafico(self, fig):
+        if self.pdf:
+            svg = fig.to_image(format="svg", width=900, height=450).decode("utf-8")
+            return f'<div class="grafico">{svg}</div>'
+        # O plotly.js vai uma única vez, junto do primeiro gráfico
+        incluir = False if self._plotlyjs_incluido else (True if self.plotlyjs == "inline" else "cdn")
+        self._plotlyjs_incluido = True
+        return f'<div class="grafico">{fig.to_html(full_html=False, include_plotlyjs=incluir, config={"displaylogo": False})}</div>'
+
+    def secao_conjunto(self, conjunto):
+        texto = TEXTOS.get(conjunto.id, {})
+        caminho = serie_temporal.sincronizar(conjunto)
+        # Sem período explícito a consulta escolhe a resolução dos resumos: no máximo
+        # PONTOS_PADRAO pontos por gráfico, seja qual for o tamanho da série
+        dados = serie_temporal.consultar(conjunto.site, conjunto.rede, caminho=caminho)
+        media = serie_temporal.media_do_periodo(dados)
+        agregado = incremental.do_conjunto(conjunto)
+        fig = graficos.grafico_download(dados, f"Variação da Velocidade de Download - {conjunto.rede}", media)
+        if self.anomalias:
+            graficos.sobrepor_anomalias(fig, anomalias.do_conjunto(conjunto))
+
+        p5, p50, p95 = agregado.quantis()
+        cartoes = [
+            (f"📊 Média de Download ({conjunto.rede})", f"{media:.2f} Mbps"),
+            ("P5 / P50 / P95", f"{p5:.0f} / {p50:.0f} / {p95:.0f} Mbps"),
+            ("Desvio padrão", f"{agregado.desvio:.2f} Mbps"),
+            ("Jitter entre testes", f"{agregado.jitter:.2f} Mbps"),
+            ("Quedas de conexão", agregado.quedas),
+        ]
+        partes = [f"<h1>{escape(conjunto.titulo)}</h1>"]
+        if "descricao" in texto:
+            partes.append(markdown_html(texto["descricao"]))
+        partes.append(self.grafico(fig))
+        partes.append('<div class="cartoes">' + "".join(
+            f"<div>{escape(rotulo)}<b>{escape(str(valor))}</b></div>" for rotulo, valor in cartoes
+        ) + "</div>")
+        if "analise" in texto:
+            partes.append(f"<h2>{escape(texto['subtitulo'])}</h2>")
+            partes.append(markdown_html(texto["analise"]))
+        return "\n".join(partes)
+
+    def secao_comparativo(self, conjuntos):
+        fig = graficos.grafico_comparativo(conjuntos, carregar_conjunto)
+        return "<h1>Comparativo</h1>\n" + self.grafico(fig)
+
+    def equipamento(self, equipamento):
+        formato = "jpeg" if self.pdf else "webp"
+        partes = [f"<h4>{escape(equipamento.nome)}</h4>"]
+        for foto in equipamento.imagens:
+            partes.append(
+                f'<figure><img src="{imagem_embutida(foto.arquivo, self.largura_imagem, formato)}" '
+                f'width="{self.largura_imagem}" alt="{escape(foto.legenda)}">'
+                f"<figcaption>{escape(foto.legenda)}</figcaption></figure>"
+            )
+        partes.append(markdown_html(equipamento.descricao))
+        return "\n".join(partes)
+
+    def secao_equipamentos(self):
+        inv = inventario()
+        partes = ["<h1>Equipamentos</h1>"]
+        for status, titulo in ((EM_USO, "Equipamentos em Uso"), (ESTOQUE, "Equipamentos em estoque")):
+            sites = inv.valores("site", status=status)
+            if not sites:
+                continue
+            partes.append(f"<h2>{titulo}</h2>")
+            for site in sites:
+                partes.append(f"<h3>📍 {escape(site)}</h3>")
+                partes.extend(self.equipamento(e) for e in inv.consultar(site=site, status=status))
+        return "\n".join(partes)
+
+    def documento(self, site=None, ids=None, equipamentos=True):
+        reg = registro()
+        partes = ["<h1>Comparando as redes Antiga/Nova</h1>"]
+        partes.extend(f"<p>{escape(p)}</p>" for p in INTRODUCAO)
+        partes.append(f"<h1>Metodologia</h1><p>{escape(METODOLOGIA)}</p>")
+        partes.append("<h1>Velocidade Recomendada de Internet por Tipo de Uso</h1>")
+        partes.append(f"<p>{escape(NOTA_VELOCIDADES)}</p>")
+        partes.append(tabela_html(list(VELOCIDADES_RECOMENDADAS), zip(*VELOCIDADES_RECOMENDADAS.values())))
+
+        for local in ([site] if site else reg.sites()):
+            conjuntos = [c for c in reg.do_site(local) if ids is None or c.id in ids]
+            partes.extend(self.secao_conjunto(c) for c in conjuntos)
+            if len(conjuntos) > 1:
+                partes.append(self.secao_comparativo(conjuntos))
+
+        if equipamentos:
+            partes.append(self.secao_equipamentos())
+
+        corpo = "\n".join(partes)
+        return (
+            '<!DOCTYPE html>\n<html lang="pt-BR"><head><meta charset="utf-8">'
+            '<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f"<title>Relatório de rede</title><style>{ESTILO}</style></head>\n<body>\n{corpo}\n</body></html>\n"
+        )
+
+
+def exportar_pdf(documento, caminho):
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError) as erro:
+        # OSError: weasyprint instalado, mas sem as bibliotecas do sistema (pango)
+        raise SystemExit(f"Exportar em PDF requer os pacotes opcionais 'weasyprint' e 'kaleido' ({erro}).")
+    HTML(string=documento, base_url=".").write_pdf(caminho)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta o relatório como HTML estático (ou PDF)")
+    parser.add_argument("-o", "--saida", default=SAIDA_PADRAO, help="arquivo .html ou .pdf")
+    parser.add_argument("--site", help="exporta só um local")
+    parser.add_argument("--conjunto", action="append", dest="conjuntos", help="id do conjunto (pode repetir)")
+    parser.add_argument("--sem-equipamentos", action="store_true")
+    parser.add_argument("--cdn", action="store_true", help="carrega o plotly.js da CDN em vez de embuti-lo")
+    parser.add_argument("--largura-imagem", type=int, default=LARGURA_PADRAO)
+    parser.add_argument("--sem-anomalias", action="store_true", help="não destaca quedas e mudanças nos gráficos")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    pdf = Path(args.saida).suffix.lower() == ".pdf"
+    if pdf:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            raise SystemExit("Exportar em PDF requer os pacotes opcionais 'weasyprint' e 'kaleido'.")
+
+    exportador = Exportador(pdf=pdf, plotlyjs="cdn" if args.cdn else "inline", largura_imagem=args.largura_imagem,
+                            anomalias=not args.sem_anomalias)
+    documento = exportador.documento(args.site, set(args.conjuntos) if args.conjuntos else None, not args.sem_equipamentos)
+    if pdf:
+        exportar_pdf(documento, args.saida)
+    else:
+        Path(args.saida).write_text(documento, encoding="utf-8")
+
+    tamanho = Path(args.saida).stat().st_size
+    print(f"Relatório salvo em '{args.saida}' ({tamanho / 1024:.0f} KB) em {time.perf_counter() - inicio:.1f} s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+import diagnostico
+from amostragem import reduzir, reduzir_df
+
+
+MAX_MARCADORES = 300
+
+# Limites das sobreposições: cada forma pesa no layout e no navegador, então ficam as maiores
+MAX_FORMAS = 150
+MAX_QUEDAS = 500
+
+# Figuras prontas compartilhadas entre sessões, limitadas pelo tamanho do JSON enviado
+# ao navegador. Como as séries de dados.carregar, não altere uma figura devolvida
+MAX_BYTES_FIGURAS = 64 * 2**20
+
+_figuras = OrderedDict()
+_bytes_figuras = 0
+_trava = threading.Lock()
+
+
+def em_cache(chave, construir):
+    # A chave precisa incluir a versão dos dados e todos os parâmetros do gráfico
+    global _bytes_figuras
+    with _trava:
+        diagnostico.cache("figuras", chave in _figuras)
+        if chave in _figuras:
+            _figuras.move_to_end(chave)
+            return _figuras[chave][0]
+
+    fig = construir()
+    tamanho = len(fig.to_json())
+
+    with _trava:
+        if chave in _figuras:
+            _bytes_figuras -= _figuras.pop(chave)[1]
+        _figuras[chave] = (fig, tamanho)
+        _bytes_figuras += tamanho
+        while _bytes_figuras > MAX_BYTES_FIGURAS and len(_figuras) > 1:
+            _bytes_figuras -= _figuras.popitem(last=False)[1][1]
+    return fig
+
+
+def grafico_download(df, titulo, media):
+    with diagnostico.trecho("figura.download", linhas=len(df)) as info:
+        fig = _grafico_download(df, titulo, media)
+        info["pontos"] = len(fig.data[0].x)
+    return fig
+
+
+def _grafico_download(df, titulo, media):
+    # O navegador recebe no máximo PONTOS_PADRAO pontos, com quedas e picos preservados
+    reduzido = reduzir_df(df, 'Timestamp', 'Download (Mbps)')
+    um_dia = len(reduzido) == 0 or reduzido['Timestamp'].dt.normalize().nunique() == 1
+
+    fig = px.line(
+        reduzido,
+        x='Timestamp',
+        y='Download (Mbps)',
+        title=titulo,
+        markers=len(reduzido) <= MAX_MARCADORES,
+        labels={'Timestamp': 'Horário', 'Download (Mbps)': 'Velocidade (Mbps)'},
+    )
+
+    # Baldes agregados: a faixa mínimo–máximo mostra as quedas escondidas pela média
+    if 'amostras' in reduzido.columns and (reduzido['amostras'] > 1).any():
+        fig.add_scatter(x=reduzido['Timestamp'], y=reduzido['maximo'], mode='lines', line_width=0,
+                        showlegend=False, hoverinfo='skip')
+        fig.add_scatter(x=reduzido['Timestamp'], y=reduzido['minimo'], mode='lines', line_width=0,
+                        fill='tonexty', fillcolor='rgba(99, 110, 250, 0.2)', name='Mínimo–máximo')
+
+    fig.add_hline(
+        y=media,
+        line_dash="dash",
+        line_color="red",
+    )
+
+    fig.update_layout(
+        xaxis_tickformat='%H:%M:%S' if um_dia else '%d/%m %H:%M', 
+        xaxis_title='Horário',
+        yaxis_title='Velocidade (Mbps)',
+    )
+    return fig
+
+
+def grafico_comparativo(conjuntos, carregar):
+    fig = go.Figure()
+    for conjunto in conjuntos:
+        serie = carregar(conjunto)
+        with diagnostico.trecho("figura.comparativo", conjunto=conjunto.id, linhas=len(serie)):
+            # Dias diferentes se sobrepõem pelo horário; só os pontos escolhidos são copiados
+            horarios = serie.horarios()
+            validos = np.flatnonzero(~np.isnan(serie.valores))
+            indices = validos[reduzir(horarios[validos], serie.valores[validos])]
+            modo = 'lines+markers' if len(indices) <= MAX_MARCADORES else 'lines'
+            fig.add_trace(go.Scatter(x=horarios[indices], y=serie.valores[indices], mode=modo, name=conjunto.rotulo))
+
+    fig.update_layout(
+        title='Variação da Velocidade de Download - Comparativo',
+        xaxis_tickformat='%H:%M:%S',
+        xaxis_title='Horário',
+        yaxis_title='Velocidade (Mbps)',
+    )
+    return fig
+
+
+def grafico_latencias(df):
+    # Uma linha por alvo de latência (ICMP/TCP); falhas viram lacunas na linha
+    fig = go.Figure()
+    latencias = df[df['tipo'].isin(('icmp', 'tcp'))]
+    for (tipo, alvo, rotulo), grupo in latencias.groupby(['tipo', 'alvo', 'rotulo'], sort=False):
+        instantes = grupo['instante_ms'].to_numpy().astype('datetime64[ms]')
+        valores = grupo['valor'].to_numpy(dtype='float64')
+        indices = reduzir(instantes, np.nan_to_num(valores, nan=0.0))
+        fig.add_trace(go.Scatter(x=instantes[indices], y=valores[indices], mode='lines', connectgaps=False,
+                                 name=f"{rotulo or alvo} ({tipo.upper()})"))
+
+    fig.update_layout(
+        title='Latência por alvo',
+        xaxis_title='Horário',
+        yaxis_title='Latência (ms)',
+        legend=dict(orientation='h', y=-0.25),
+    )
+    return fig
+
+
+def _ms(instante, padrao):
+    return padrao if instante is None else int(np.datetime64(instante, 'ms').astype('int64'))
+
+
+def _data(ms):
+    return str(np.datetime64(int(ms), 'ms'))
+
+
+def _faixas(inicios, fins, inicio_ms, fim_ms, cor):
+    visiveis = (fins >= inicio_ms) & (inicios <= fim_ms)
+    inicios, fins = inicios[visiveis], fins[visiveis]
+    if len(inicios) > MAX_FORMAS:
+        maiores = np.sort(np.argsort(fins - inicios)[-MAX_FORMAS:])
+        inicios, fins = inicios[maiores], fins[maiores]
+    return [
+        dict(type='rect', xref='x', yref='paper', x0=_data(a), x1=_data(b), y0=0, y1=1,
+             fillcolor=cor, line_width=0, layer='below')
+        for a, b in zip(inicios, fins)
+    ]
+
+
+def sobrepor_anomalias(fig, anomalias, inicio=None, fim=None, uso=None, eventos=True):
+    # Formas e anotações entram numa única atualização do layout: add_vrect/add_vline
+    # validariam o layout inteiro a cada chamada. eventos=False deixa só a faixa do uso
+    inicio_ms = _ms(inicio, np.iinfo('int64').min)
+    fim_ms = _ms(fim, np.iinfo('int64').max)
+    formas, anotacoes = [], []
+
+    faixas = _faixas(*anomalias.sem_conexao, inicio_ms, fim_ms, 'rgba(239, 85, 59, 0.25)') if eventos else []
+    if faixas:
+        formas += faixas
+        fig.add_scatter(x=[None], y=[None], mode='markers', name='Sem conexão',
+                        marker=dict(symbol='square', size=12, color='rgba(239, 85, 59, 0.4)'))
+
+    if uso is not None:
+        limiar, inicios, fins = anomalias.abaixo[uso]
+        formas += _faixas(inicios, fins, inicio_ms, fim_ms, 'rgba(255, 161, 90, 0.15)')
+        formas.append(dict(type='line', xref='paper', x0=0, x1=1, y0=limiar, y1=limiar,
+                           line=dict(color='orange', dash='dot', width=1.5)))
+        anotacoes.append(dict(xref='paper', x=1, y=limiar, text=f"{uso} ({limiar:g} Mbps)", showarrow=False,
+                              xanchor='right', yanchor='bottom', font=dict(size=10, color='orange')))
+
+    visiveis = (anomalias.mudancas_ms >= inicio_ms) & (anomalias.mudancas_ms <= fim_ms) & eventos
+    for instante, antes, depois in list(zip(anomalias.mudancas_ms[visiveis], anomalias.mudancas_antes[visiveis],
+                                            anomalias.mudancas_depois[visiveis]))[-MAX_FORMAS:]:
+        formas.append(dict(type='line', xref='x', yref='paper', x0=_data(instante), x1=_data(instante), y0=0, y1=1,
+                           line=dict(color='gray', dash='dash', width=1)))
+        anotacoes.append(dict(x=_data(instante), yref='paper', y=1, text=f"{antes:.0f} → {depois:.0f} Mbps",
+                              showarrow=False, xanchor='left', yanchor='top', font=dict(size=10)))
+
+    visiveis = (anomalias.quedas_ms >= inicio_ms) & (anomalias.quedas_ms <= fim_ms) & eventos
+    instantes, valores = anomalias.quedas_ms[visiveis], anomalias.quedas_valor[visiveis]
+    if len(instantes):
+        if len(instantes) > MAX_QUEDAS:
+            # As mais profundas em relação à mediana de referência
+            referencia = anomalias.quedas_referencia[visiveis]
+            piores = np.sort(np.argsort(valores / np.maximum(referencia, 1e-9))[:MAX_QUEDAS])
+            instantes, valores = instantes[piores], valores[piores]
+        fig.add_scatter(x=instantes.astype('datetime64[ms]'), y=valores, mode='markers', name='Queda brusca',
+                        marker=dict(symbol='x', size=8, color='rgb(239, 85, 59)'))
+
+    fig.update_layout(shapes=list(fig.layout.shapes) + formas, annotations=list(fig.layout.annotations) + anotacoes)
+    return fig
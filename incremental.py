@@ -0,0 +1,179 @@
+import threading
+
+import numpy as np
+
+import diagnostico
+from estatisticas import LIMITE_QUEDA_MBPS
+from registro import carregar_desde, versao
+
+
+class TDigest:
+    # t-digest "merging": novos valores vão para um buffer e são fundidos aos centróides em
+    # lote, com o tamanho de cada grupo limitado pela função de escala k1
+    def __init__(self, compressao=200, tamanho_buffer=5000):
+        self.compressao = compressao
+        self.tamanho_buffer = tamanho_buffer
+        self.medias = np.empty(0)
+        self.pesos = np.empty(0)
+        self._buffer = []
+        self._no_buffer = 0
+
+    def adicionar(self, valores):
+        valores = np.asarray(valores, dtype="float64")
+        valores = valores[~np.isnan(valores)]
+        if not len(valores):
+            return
+        self._buffer.append(valores)
+        self._no_buffer += len(valores)
+        if self._no_buffer >= self.tamanho_buffer:
+            self._comprimir()
+
+    def _comprimir(self):
+        if not self._buffer:
+            return
+        novos = np.concatenate(self._buffer)
+        self._buffer, self._no_buffer = [], 0
+        self.medias, self.pesos = self._fundir(self.medias, self.pesos, novos)
+
+    def _fundir(self, medias, pesos, novos):
+        medias = np.concatenate((medias, novos))
+        pesos = np.concatenate((pesos, np.ones(len(novos))))
+        ordem = np.argsort(medias, kind="stable")
+        medias, pesos = medias[ordem], pesos[ordem]
+
+        total = pesos.sum()
+        q = (np.cumsum(pesos) - pesos / 2) / total
+        k = self.compressao / (2 * np.pi) * np.arcsin(2 * q - 1)
+        grupo = np.floor(k - k[0]).astype("int64")
+        inicios = np.flatnonzero(np.diff(grupo, prepend=-1))
+
+        pesos_grupos = np.add.reduceat(pesos, inicios)
+        return np.add.reduceat(medias * pesos, inicios) / pesos_grupos, pesos_grupos
+
+    @property
+    def contagem(self):
+        return float(self.pesos.sum()) + self._no_buffer
+
+    def quantis(self, qs):
+        # Só leitura: o digest é compartilhado entre sessões e só muda sob a trava do conjunto,
+        # então o buffer pendente é fundido numa cópia local
+        medias, pesos, buffer = self.medias, self.pesos, list(self._buffer)
+        if buffer:
+            medias, pesos = self._fundir(medias, pesos, np.concatenate(buffer))
+        if not len(medias):
+            return np.full(len(qs), np.nan)
+        if len(medias) == 1:
+            return np.full(len(qs), medias[0])
+        posicoes = (np.cumsum(pesos) - pesos / 2) / pesos.sum()
+        return np.interp(qs, posicoes, medias)
+
+
+class AgregadoIncremental:
+    # Estado de tamanho constante: cada atualização custa O(linhas novas), nunca O(histórico)
+    def __init__(self, limite_queda=LIMITE_QUEDA_MBPS):
+        self.limite_queda = limite_queda
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.marca = 0
+        self.assinatura = None
+        self.versao = None
+        self.amostras = 0
+        self.falhas = 0
+        self.contagem = 0
+        self.soma = 0.0
+        self.soma2 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self.soma_variacoes = 0.0
+        self.ultimo = None
+        self.quedas = 0
+        self._em_queda = False
+        self.digest = TDigest()
+        self.contagem_hora = np.zeros(24, dtype="int64")
+        self.soma_hora = np.zeros(24)
+        self.minimo_hora = np.full(24, np.inf)
+
+    def incorporar(self, instantes, valores):
+        valores = np.asarray(valores, dtype="float64")
+        if not len(valores):
+            return
+        self.amostras += len(valores)
+
+        em_queda = np.isnan(valores) | (np.nan_to_num(valores) < self.limite_queda)
+        entradas = np.flatnonzero(em_queda & ~np.concatenate(([self._em_queda], em_queda[:-1])))
+        self.quedas += len(entradas)
+        self._em_queda = bool(em_queda[-1])
+
+        validos = ~np.isnan(valores)
+        self.falhas += int((~validos).sum())
+        v = valores[validos]
+        if not len(v):
+            return
+
+        self.contagem += len(v)
+        self.soma += float(v.sum())
+        self.soma2 += float((v * v).sum())
+        self.minimo = min(self.minimo, float(v.min()))
+        self.maximo = max(self.maximo, float(v.max()))
+        encadeados = v if self.ultimo is None else np.concatenate(([self.ultimo], v))
+        self.soma_variacoes += float(np.abs(np.diff(encadeados)).sum())
+        self.ultimo = float(v[-1])
+        self.digest.adicionar(v)
+
+        horas = np.asarray(instantes)[validos].astype("datetime64[h]").astype("int64") % 24
+        self.contagem_hora += np.bincount(horas, minlength=24)
+        self.soma_hora += np.bincount(horas, weights=v, minlength=24)
+        np.minimum.at(self.minimo_hora, horas, v)
+
+    @property
+    def media(self):
+        return self.soma / self.contagem if self.contagem else float("nan")
+
+    @property
+    def desvio(self):
+        if not self.contagem:
+            return float("nan")
+        return float(np.sqrt(max(self.soma2 / self.contagem - self.media ** 2, 0.0)))
+
+    @property
+    def jitter(self):
+        return self.soma_variacoes / (self.contagem - 1) if self.contagem > 1 else 0.0
+
+    def quantis(self, qs=(0.05, 0.5, 0.95)):
+        return self.digest.quantis(np.asarray(qs))
+
+    def por_hora(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            media = self.soma_hora / self.contagem_hora
+        return media, self.contagem_hora.copy(), np.where(self.contagem_hora > 0, self.minimo_hora, np.nan)
+
+
+_agregados = {}
+_trava = threading.Lock()
+
+
+def do_conjunto(conjunto):
+    # Incorpora só as linhas além da marca d'água; se o arquivo foi reescrito, recomeça. A
+    # trava é por conjunto: a leitura fria de uma planilha não segura as sessões dos outros
+    with _trava:
+        agregado, trava = _agregados.setdefault(conjunto.id, (AgregadoIncremental(), threading.Lock()))
+
+    with trava:
+        atual = versao(conjunto)
+        diagnostico.cache("incremental.agregado", agregado.versao == atual)
+        if agregado.versao == atual:
+            return agregado
+
+        with diagnostico.trecho("incremental.incorporar", conjunto=conjunto.id) as info:
+            novos, marca, assinatura, reescrito = carregar_desde(conjunto, agregado.marca, agregado.assinatura)
+            if reescrito:
+                agregado.reiniciar()
+                novos, marca, assinatura, _ = carregar_desde(conjunto, 0, None)
+
+            agregado.incorporar(novos.datas(), novos.valores)
+            # Funde o buffer do digest ainda sob a trava: quem lê os quantis não altera nada
+            agregado.digest._comprimir()
+            agregado.marca, agregado.assinatura, agregado.versao = marca, assinatura, atual
+            info["novas"] = len(novos)
+        return agregado
@@ -0,0 +1,133 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from dados import ler_colunar
+
+
+PADROES = ("testes_velocidade*.xlsx", "testes_velocidade*.csv", "testes_velocidade*.parquet")
+COLUNAS = ['Timestamp', 'Download (Mbps)', 'arquivo']
+
+
+@dataclass
+class RelatorioArquivo:
+    caminho: str
+    linhas: int
+    segundos: float
+    erro: str | None = None
+
+
+def descobrir(pasta, padroes=PADROES, recursivo=False):
+    pasta = Path(pasta)
+    encontrados = set()
+    for padrao in padroes:
+        encontrados.update(pasta.rglob(padrao) if recursivo else pasta.glob(padrao))
+    return sorted(str(c) for c in encontrados)
+
+
+def normalizar(df, arquivo):
+    # Planilhas antigas: "Timestamp" só com a data e "hora" só com o horário.
+    # Saída do coletor: "Timestamp" completo e nenhuma coluna "hora". A saída sempre traz o
+    # instante completo; o horário do dia, quando preciso, sai dele (SerieCompacta.horarios)
+    if 'Download (Mbps)' not in df.columns:
+        raise ValueError("coluna 'Download (Mbps)' ausente")
+
+    if 'hora' in df.columns:
+        hora = pd.to_datetime(df['hora'].astype(str).str[-8:], format='%H:%M:%S')
+        deslocamento = hora - hora.dt.normalize()
+        if 'Timestamp' in df.columns:
+            instante = pd.to_datetime(df['Timestamp']).dt.normalize() + deslocamento
+        else:
+            instante = hora
+    elif 'Timestamp' in df.columns:
+        instante = pd.to_datetime(df['Timestamp'])
+    else:
+        raise ValueError("nenhuma coluna de tempo ('Timestamp' ou 'hora')")
+
+    return pd.DataFrame({
+        'Timestamp': instante.astype('datetime64[ns]'),
+        'Download (Mbps)': pd.to_numeric(df['Download (Mbps)'], errors='coerce').astype('float64'),
+        'arquivo': arquivo,
+    })
+
+
+def ler_arquivo(caminho):
+    # Roda dentro dos processos do pool: devolve o erro em vez de levantá-lo, para que um
+    # arquivo corrompido não derrube a ingestão inteira
+    inicio = time.perf_counter()
+    try:
+        sufixo = Path(caminho).suffix.lower()
+        if sufixo == ".xlsx":
+            bruto = ler_colunar(caminho).tabela()
+        elif sufixo == ".csv":
+            bruto = pd.read_csv(caminho)
+        elif sufixo == ".parquet":
+            bruto = pd.read_parquet(caminho)
+        else:
+            raise ValueError(f"formato não suportado: {sufixo}")
+        df = normalizar(bruto, Path(caminho).name)
+        return df, RelatorioArquivo(caminho, len(df), time.perf_counter() - inicio)
+    except Exception as erro:
+        return None, RelatorioArquivo(caminho, 0, time.perf_counter() - inicio, f"{type(erro).__name__}: {erro}")
+
+
+def ingerir(arquivos, processos=None, inicio_processos=None):
+    # inicio_processos: "spawn" ou "forkserver" quando quem chama tem várias threads (o
+    # servidor do Streamlit); fork copiaria travas seguradas por outras threads
+    arquivos = list(arquivos)
+    if len(arquivos) <= 1 or processos == 1:
+        resultados = [ler_arquivo(c) for c in arquivos]
+    else:
+        processos = processos or min(len(arquivos), os.cpu_count() or 1)
+        contexto = multiprocessing.get_context(inicio_processos) if inicio_processos else None
+        with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as pool:
+            resultados = list(pool.map(ler_arquivo, arquivos))
+
+    relatorios = [relatorio for _, relatorio in resultados]
+    partes = [df for df, _ in resultados if df is not None and len(df)]
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS), relatorios
+
+    df = pd.concat(partes, ignore_index=True)
+    df['arquivo'] = df['arquivo'].astype('category')
+    df = df.sort_values('Timestamp', kind='stable', ignore_index=True)
+    return df, relatorios
+
+
+def ingerir_pasta(pasta, padroes=PADROES, recursivo=False, processos=None):
+    return ingerir(descobrir(pasta, padroes, recursivo), processos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lê em paralelo todas as exportações de testes de velocidade de uma pasta")
+    parser.add_argument("pasta", nargs="?", default=".")
+    parser.add_argument("--padrao", action="append", dest="padroes", help="glob dos arquivos (pode repetir)")
+    parser.add_argument("-r", "--recursivo", action="store_true")
+    parser.add_argument("-j", "--processos", type=int, default=None)
+    parser.add_argument("-o", "--saida", help="grava o resultado consolidado em Parquet")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    df, relatorios = ingerir_pasta(args.pasta, args.padroes or PADROES, args.recursivo, args.processos)
+    total = time.perf_counter() - inicio
+
+    for relatorio in relatorios:
+        situacao = f"ERRO {relatorio.erro}" if relatorio.erro else f"{relatorio.linhas} linhas"
+        print(f"{relatorio.segundos * 1000:8.1f} ms  {relatorio.caminho}: {situacao}")
+    erros = sum(1 for r in relatorios if r.erro)
+    print(f"{len(relatorios)} arquivos, {len(df)} linhas, {erros} com erro, em {total:.2f} s.")
+
+    if args.saida:
+        df.to_parquet(args.saida, index=False)
+        print(f"Resultado salvo em '{args.saida}'.")
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
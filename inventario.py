@@ -0,0 +1,76 @@
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+
+ARQUIVO_INVENTARIO = "equipamentos.json"
+EM_USO = "em uso"
+ESTOQUE = "estoque"
+
+
+@dataclass(frozen=True)
+class Imagem:
+    arquivo: str
+    legenda: str
+
+
+@dataclass(frozen=True)
+class Equipamento:
+    id: str
+    site: str
+    tipo: str
+    status: str
+    nome: str
+    imagens: tuple
+    descricao: str
+    # Host ou host:porta na rede local, para as sondas de alcance (sondas.py)
+    endereco: str = ""
+
+
+class Inventario:
+    # Índices invertidos por site, tipo e situação: uma consulta é a interseção de conjuntos
+    # de ids, sem percorrer o catálogo inteiro
+    def __init__(self, equipamentos):
+        self.equipamentos = list(equipamentos)
+        self._por_id = {e.id: e for e in self.equipamentos}
+        self._ordem = {e.id: i for i, e in enumerate(self.equipamentos)}
+        self._indices = {"site": {}, "tipo": {}, "status": {}}
+        for equipamento in self.equipamentos:
+            for campo, indice in self._indices.items():
+                indice.setdefault(getattr(equipamento, campo), set()).add(equipamento.id)
+
+    def valores(self, campo, **filtros):
+        ids = self._filtrar(**filtros)
+        return [valor for valor, membros in self._indices[campo].items() if membros & ids]
+
+    def _filtrar(self, **filtros):
+        ids = set(self._por_id)
+        for campo, valor in filtros.items():
+            if valor is None:
+                continue
+            valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+            ids &= set().union(*(self._indices[campo].get(v, set()) for v in valores))
+        return ids
+
+    def consultar(self, site=None, tipo=None, status=None):
+        ids = self._filtrar(site=site, tipo=tipo, status=status)
+        return [self._por_id[i] for i in sorted(ids, key=self._ordem.get)]
+
+    def obter(self, id):
+        return self._por_id[id]
+
+
+def _equipamento(entrada):
+    imagens = tuple(Imagem(**imagem) for imagem in entrada.get("imagens", []))
+    return Equipamento(**{**entrada, "imagens": imagens})
+
+
+@lru_cache(maxsize=4)
+def _ler_inventario(caminho, mtime_ns):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return Inventario(_equipamento(entrada) for entrada in json.load(arquivo))
+
+
+def inventario(caminho=ARQUIVO_INVENTARIO):
+    return _ler_inventario(caminho, Path(caminho).stat().st_mtime_ns)
@@ -0,0 +1,113 @@
+import argparse
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+from PIL import Image, ImageOps
+
+import diagnostico
+
+
+# Dentro de static/ as miniaturas são servidas direto pelo servidor estático do Streamlit
+# (server.enableStaticServing em .streamlit/config.toml), com cache no navegador
+PASTA_ESTATICA = Path("static")
+PASTA_MINIATURAS = PASTA_ESTATICA / "miniaturas"
+LARGURA_PADRAO = 300
+ESCALAS = (1, 2)
+QUALIDADE = 75
+
+_resumos = {}
+_trava = threading.Lock()
+
+
+def resumo(caminho):
+    # O hash do conteúdo é a chave do cache em disco; mtime + tamanho evitam reler o arquivo
+    info = os.stat(caminho)
+    chave = (str(caminho), info.st_mtime_ns, info.st_size)
+    with _trava:
+        if chave in _resumos:
+            return _resumos[chave]
+    with open(caminho, "rb") as arquivo:
+        valor = hashlib.sha1(arquivo.read()).hexdigest()[:16]
+    with _trava:
+        _resumos[chave] = valor
+    return valor
+
+
+def caminho_miniatura(caminho, largura=LARGURA_PADRAO, escala=1, formato="webp"):
+    return PASTA_MINIATURAS / f"{Path(caminho).stem}-{resumo(caminho)}-{largura * escala}.{formato}"
+
+
+def url_estatica(destino):
+    return "app/static/" + quote(Path(destino).relative_to(PASTA_ESTATICA).as_posix())
+
+
+def gerar(caminho, largura=LARGURA_PADRAO, escala=1, formato="webp", qualidade=QUALIDADE):
+    destino = caminho_miniatura(caminho, largura, escala, formato)
+    diagnostico.cache("miniaturas", destino.exists())
+    if destino.exists():
+        return destino
+
+    with Image.open(caminho) as original:
+        # Fotos de celular vêm "deitadas" com a rotação só no EXIF
+        imagem = ImageOps.exif_transpose(original)
+        pixels = largura * escala
+        if imagem.width > pixels:
+            imagem = imagem.resize((pixels, round(imagem.height * pixels / imagem.width)), Image.LANCZOS)
+        if imagem.mode not in ("RGB", "L"):
+            imagem = imagem.convert("RGB")
+
+        # Arquivo temporário único: sessões que abrem a galeria fria ao mesmo tempo geram a
+        # mesma miniatura, e a última renomeação vence
+        PASTA_MINIATURAS.mkdir(parents=True, exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(prefix=f"{destino.stem}.", suffix=".tmp", dir=PASTA_MINIATURAS)
+        os.close(descritor)
+        try:
+            if formato == "webp":
+                imagem.save(temporario, "WEBP", quality=qualidade, method=6)
+            else:
+                imagem.save(temporario, "JPEG", quality=qualidade, optimize=True, progressive=True)
+            os.replace(temporario, destino)
+        except OSError:
+            # No Windows a troca falha se outra sessão estiver servindo o arquivo pronto
+            if not destino.exists():
+                raise
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+    return destino
+
+
+def gerar_todas(pasta="images", largura=LARGURA_PADRAO, formato="webp"):
+    gerados = []
+    for caminho in sorted(Path(pasta).iterdir()):
+        if caminho.suffix.lower() not in (".jpg", ".jpeg", ".png"):
+            continue
+        for escala in ESCALAS:
+            gerados.append((caminho, escala, gerar(caminho, largura, escala, formato)))
+    return gerados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera as miniaturas das fotos de equipamentos")
+    parser.add_argument("--pasta", default="images")
+    parser.add_argument("--largura", type=int, default=LARGURA_PADRAO)
+    parser.add_argument("--formato", choices=["webp", "jpeg"], default="webp")
+    args = parser.parse_args(argv)
+
+    originais = {}
+    por_escala = dict.fromkeys(ESCALAS, 0)
+    for original, escala, miniatura in gerar_todas(args.pasta, args.largura, args.formato):
+        originais[original] = original.stat().st_size
+        por_escala[escala] += miniatura.stat().st_size
+        print(f"{original.name} -> {miniatura.name} ({miniatura.stat().st_size / 1024:.0f} KB)")
+
+    variantes = ", ".join(f"{escala}x: {total / 1024:.0f} KB" for escala, total in por_escala.items())
+    print(f"Originais: {sum(originais.values()) / 1024:.0f} KB; miniaturas {variantes}.")
+
+
+if __name__ == "__main__":
+    main()
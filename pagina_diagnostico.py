@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+
+import diagnostico
+
+
+def pag_diagnostico():
+    st.title("Diagnóstico")
+
+    reruns = diagnostico.historico()
+    if st.toggle("Somente esta sessão"):
+        reruns = [r for r in reruns if r.sessao == st.session_state.sessao]
+    if not reruns:
+        st.info("Nenhum rerun registrado ainda.")
+        return
+
+    st.download_button("⬇️ Exportar JSONL", diagnostico.exportar_jsonl(reruns),
+                       file_name="diagnostico.jsonl", mime="application/jsonl")
+
+    trechos = pd.DataFrame(
+        [(t.nome, t.duracao_ms) for r in reruns for t in r.trechos],
+        columns=["Trecho", "ms"],
+    )
+    if len(trechos):
+        st.subheader("Trechos")
+        resumo = trechos.groupby("Trecho")["ms"].agg(
+            Chamadas="count", Mediana="median", P95=lambda ms: ms.quantile(0.95), Máximo="max", Total="sum",
+        )
+        st.dataframe(resumo.sort_values("Total", ascending=False).round(1))
+
+    cache = {}
+    for r in reruns:
+        for nome, (acertos, falhas) in r.cache.items():
+            total = cache.get(nome, (0, 0))
+            cache[nome] = (total[0] + acertos, total[1] + falhas)
+    if cache:
+        st.subheader("Caches")
+        st.dataframe(pd.DataFrame(
+            [{"Cache": nome, "Acertos": a, "Falhas": f, "Taxa de acerto": f"{a / (a + f):.0%}"} for nome, (a, f) in cache.items()]
+        ), hide_index=True)
+
+    st.subheader("Reruns")
+    st.dataframe(pd.DataFrame([
+        {
+            "Instante": datetime.fromtimestamp(r.instante).strftime("%H:%M:%S"),
+            "Sessão": r.sessao,
+            "Página": r.pagina,
+            "Duração (ms)": round(r.duracao_ms, 1),
+            "Trechos": len(r.trechos),
+            "Mais lento": max(r.trechos, key=lambda t: t.duracao_ms).nome if r.trechos else "",
+        }
+        for r in reversed(reruns)
+    ]), hide_index=True)
+
+    if st.button("Limpar histórico"):
+        diagnostico.limpar()
+        st.rerun()
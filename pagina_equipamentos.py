@@ -0,0 +1,59 @@
+from html import escape
+
+import streamlit as st
+
+import diagnostico
+from inventario import EM_USO, ESTOQUE, inventario
+from miniaturas import LARGURA_PADRAO, gerar as gerar_miniatura, url_estatica
+
+
+def imagem(caminho, legenda, largura=LARGURA_PADRAO):
+    # st.image decodificaria, redimensionaria e recomprimiria a foto em JPEG a cada rerun;
+    # pelo servidor estático o navegador escolhe a variante 1x/2x e a reaproveita do cache.
+    # A foto original só é enviada quando pedida
+    with diagnostico.trecho("imagem.miniaturas", arquivo=caminho):
+        um, dois = [url_estatica(gerar_miniatura(caminho, largura, escala)) for escala in (1, 2)]
+    st.markdown(
+        f'<figure style="margin: 0 0 1rem 0"><img src="{um}" srcset="{um} 1x, {dois} 2x" width="{largura}" alt="{escape(legenda)}">'
+        f'<figcaption style="font-size: 0.875rem; opacity: 0.6">{escape(legenda)}</figcaption></figure>',
+        unsafe_allow_html=True,
+    )
+    if st.toggle("🔍 Ver foto original", key=f"original-{caminho}"):
+        st.image(caminho, caption=legenda)
+
+
+def exibir_equipamento(equipamento, mostrar_site=False):
+    if mostrar_site:
+        st.caption(f"📍 {equipamento.site}")
+    for foto in equipamento.imagens:
+        imagem(foto.arquivo, foto.legenda)
+    st.markdown(equipamento.descricao)
+    st.text("")
+
+
+def pag2():
+    st.title("Equipamentos")
+
+    inv = inventario()
+    status = st.radio(
+        "Situação",
+        [EM_USO, ESTOQUE],
+        format_func=lambda s: "Equipamentos em Uso" if s == EM_USO else "Equipamentos em estoque",
+        horizontal=True,
+        label_visibility="collapsed",
+    )
+
+    sites = inv.valores("site", status=status)
+    if not sites:
+        st.info("Nenhum equipamento cadastrado nesta situação.")
+        return
+
+    col1, col2 = st.columns(2)
+    site = col1.selectbox("📍 Local", sites, index=None, placeholder="Escolha um local")
+    tipos = col2.multiselect("Tipo de equipamento", inv.valores("tipo", status=status, site=site))
+
+    # Nada do catálogo é montado nem enviado ao navegador até haver um local ou filtro escolhido
+    if site is None and not tipos:
+        return
+    for equipamento in inv.consultar(site=site, tipo=tipos or None, status=status):
+        exibir_equipamento(equipamento, mostrar_site=site is None)
@@ -0,0 +1,274 @@
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import streamlit as st
+import pandas as pd
+
+import anomalias
+import diagnostico
+import estatisticas
+import graficos
+import incremental
+import serie_temporal
+import sondas
+from amostragem import PONTOS_PADRAO
+from registro import carregar as carregar_conjunto, registro, versao
+from textos import COLETA, COMANDO_COLETA, INTRODUCAO, METODOLOGIA, NOTA_VELOCIDADES, REGISTRO_COLETA, TEXTOS, VELOCIDADES_RECOMENDADAS
+
+
+ROTULOS_SONDAS = {"icmp": "Ping (ICMP)", "tcp": "Conexão TCP", "http": "Download HTTP", "upload": "Upload HTTP"}
+COMPARATIVO = "__comparativo__"
+
+
+def pag1():
+    st.title("Comparando as redes Antiga/Nova")
+
+    for paragrafo in INTRODUCAO:
+        st.write(paragrafo)
+
+    st.title("Metodologia")
+    st.write(METODOLOGIA)
+
+    with st.expander("🔍 Ver código do teste de velocidade"):
+        st.markdown(COLETA)
+        st.code(COMANDO_COLETA, language="bash")
+        st.code(REGISTRO_COLETA, language="json")
+
+    st.title("Velocidade Recomendada de Internet por Tipo de Uso")
+
+    st.markdown(NOTA_VELOCIDADES)
+
+    with st.expander("Tabela de velocidades ideais"):
+        ideal = pd.DataFrame(VELOCIDADES_RECOMENDADAS)
+
+        st.dataframe(ideal)
+
+    reg = registro()
+    site = st.selectbox("Local", reg.sites())
+    conjuntos = reg.do_site(site)
+
+    opcoes = [c.id for c in conjuntos]
+    if len(conjuntos) > 1:
+        opcoes.append(COMPARATIVO)
+    escolha = st.radio(
+        "Conjunto de testes",
+        opcoes,
+        format_func=lambda id: "Comparativo" if id == COMPARATIVO else reg.obter(id).titulo,
+        horizontal=True,
+    )
+
+    # Só o conjunto escolhido é lido do disco; os demais ficam apenas no registro
+    if escolha == COMPARATIVO:
+        secao_comparativo(conjuntos)
+    else:
+        secao_conjunto(reg.obter(escolha))
+
+
+def periodo_visivel(caminho, conjunto):
+    primeiro, ultimo, total = serie_temporal.extensao(caminho, conjunto.site, conjunto.rede)
+    if primeiro is None:
+        return None, None
+
+    dias = (primeiro.date(), ultimo.date())
+    if dias[0] != dias[1]:
+        dias = st.date_input("Período", value=dias, min_value=dias[0], max_value=dias[1], key=f"periodo-{conjunto.id}")
+        if len(dias) < 2:
+            dias = (dias[0], dias[0])
+    inicio = max(primeiro, datetime.combine(dias[0], time.min))
+    fim = min(ultimo, datetime.combine(dias[1], time.max))
+
+    # Dentro de um dia, séries longas ganham um ajuste fino de horário; estreitar a janela
+    # faz a consulta descer para resoluções menores
+    if dias[0] == dias[1] and total > PONTOS_PADRAO and inicio < fim:
+        inicio, fim = st.slider("Horário", min_value=inicio, max_value=fim, value=(inicio, fim),
+                                format="HH:mm:ss", key=f"horario-{conjunto.id}-{dias[0]}")
+    return inicio, fim
+
+
+def formatar_duracao(segundos):
+    minutos, segundos = divmod(int(round(segundos)), 60)
+    horas, minutos = divmod(minutos, 60)
+    return f"{horas}h{minutos:02d}m{segundos:02d}s" if horas else f"{minutos}m{segundos:02d}s"
+
+
+def quadro_estatisticas(conjunto, agregado):
+    # Os cartões vêm dos agregados incrementais: custo constante a cada nova amostra
+    p5, p50, p95 = agregado.quantis()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("P5 / P50 / P95", f"{p5:.0f} / {p50:.0f} / {p95:.0f} Mbps")
+    col2.metric("Desvio padrão", f"{agregado.desvio:.2f} Mbps")
+    col3.metric("Jitter entre testes", f"{agregado.jitter:.2f} Mbps")
+    col4.metric("Quedas de conexão", agregado.quedas)
+
+    media_hora, contagem_hora, _ = agregado.por_hora()
+    if (contagem_hora > 0).sum() > 1:
+        com_dados = contagem_hora > 0
+        st.bar_chart(
+            pd.DataFrame({"Média (Mbps)": media_hora[com_dados]}, index=[f"{h:02d}h" for h in range(24) if com_dados[h]]),
+            height=200,
+        )
+
+    # A análise completa percorre o histórico inteiro, então só roda quando pedida
+    if not st.toggle("📈 Estabilidade e tempo abaixo do recomendado", key=f"detalhes-{conjunto.id}"):
+        return
+    with diagnostico.trecho("estatisticas.do_conjunto", conjunto=conjunto.id):
+        est = estatisticas.do_conjunto(conjunto)
+    st.markdown(f"""
+- Amostras: **{est.amostras}** ({est.falhas} falhas de medição) em **{formatar_duracao(est.duracao_s)}**
+- Mínimo / máximo: **{est.minimo:.2f} / {est.maximo:.2f} Mbps**
+- Variação média em janelas de {estatisticas.JANELA_ESTABILIDADE} testes: **{est.variacao_janela:.1%}** (pior janela: {est.pior_variacao_janela:.1%})
+- Tempo em queda (< {estatisticas.LIMITE_QUEDA_MBPS:g} Mbps): **{formatar_duracao(est.tempo_em_queda_s)}**, maior queda: **{formatar_duracao(est.maior_queda_s)}**
+""")
+    st.dataframe(pd.DataFrame(
+        [
+            {"Uso": uso, "Mínimo recomendado (Mbps)": limiar, "Tempo abaixo": formatar_duracao(tempo), "% do tempo": f"{fracao:.1%}"}
+            for uso, (limiar, tempo, fracao) in est.abaixo.items()
+        ]
+    ), hide_index=True)
+
+
+def quadro_anomalias(detectadas, inicio, fim, uso):
+    # Contagens do período visível, calculadas a partir dos dados e não do texto da análise
+    inicio_ms = serie_temporal.para_ms(inicio) if inicio is not None else float("-inf")
+    fim_ms = serie_temporal.para_ms(fim) if fim is not None else float("inf")
+
+    quedas = ((detectadas.quedas_ms >= inicio_ms) & (detectadas.quedas_ms <= fim_ms)).sum()
+    inicios, fins = detectadas.sem_conexao
+    visiveis = (fins >= inicio_ms) & (inicios <= fim_ms)
+    duracoes = (np.minimum(fins[visiveis], fim_ms) - np.maximum(inicios[visiveis], inicio_ms)) / 1000
+    mudancas = (detectadas.mudancas_ms >= inicio_ms) & (detectadas.mudancas_ms <= fim_ms)
+
+    linhas = [
+        f"- Quedas bruscas (mais de {anomalias.LIMIAR_MAD:g} MAD abaixo da mediana): **{quedas}**",
+        f"- Períodos sem conexão: **{visiveis.sum()}**"
+        + (f", somando **{formatar_duracao(duracoes.sum())}** (maior: {formatar_duracao(duracoes.max())})" if len(duracoes) else ""),
+        f"- Mudanças de patamar (CUSUM): **{mudancas.sum()}**",
+    ]
+    for instante, antes, depois in list(zip(detectadas.mudancas_ms[mudancas], detectadas.mudancas_antes[mudancas],
+                                            detectadas.mudancas_depois[mudancas]))[-5:]:
+        quando = serie_temporal.EPOCA + timedelta(milliseconds=int(instante))
+        linhas.append(f"    - {quando:%d/%m %H:%M:%S}: {antes:.0f} → {depois:.0f} Mbps")
+    if uso is not None:
+        limiar, inicios, fins = detectadas.abaixo[uso]
+        visiveis = (fins >= inicio_ms) & (inicios <= fim_ms)
+        tempo = (np.minimum(fins[visiveis], fim_ms) - np.maximum(inicios[visiveis], inicio_ms)).sum() / 1000
+        linhas.append(f"- Mediana abaixo de {limiar:g} Mbps ({uso}): **{formatar_duracao(tempo)}** em {visiveis.sum()} períodos")
+    st.markdown("\n".join(linhas))
+
+
+def quadro_sondagens(caminho, conjunto, inicio, fim):
+    # Sondagens gravadas por sondas.py no mesmo banco da série; conjuntos de planilha não têm.
+    # Nas pontas da série o período fica aberto: as sondas não rodam junto com os downloads
+    primeiro, ultimo, _ = serie_temporal.extensao(caminho, conjunto.site, conjunto.rede)
+    inicio_ms = serie_temporal.para_ms(inicio) if inicio is not None and inicio > primeiro else None
+    fim_ms = serie_temporal.para_ms(fim) if fim is not None and fim < ultimo else None
+    with diagnostico.trecho("sondas.ler", rede=conjunto.rede) as info:
+        df = sondas.ler(caminho, conjunto.site, conjunto.rede, inicio_ms, fim_ms)
+        info["linhas"] = len(df)
+    if df.empty:
+        return
+
+    st.subheader("📡 Latência, upload e equipamentos")
+    resumo = sondas.resumir(df)
+
+    def ultimo(ms):
+        return "—" if ms is None or ms != ms else f"{serie_temporal.EPOCA + timedelta(milliseconds=int(ms)):%d/%m %H:%M:%S}"
+
+    def medida(valor, tipo):
+        return "—" if valor != valor else f"{valor:.1f} {'ms' if tipo in sondas.LATENCIAS else 'Mbps'}"
+
+    servicos = resumo[resumo["rotulo"] == ""]
+    if len(servicos):
+        st.dataframe(pd.DataFrame({
+            "Sonda": servicos["tipo"].map(ROTULOS_SONDAS),
+            "Alvo": servicos["alvo"],
+            "Testes": servicos["testes"],
+            "Perda": servicos["perda"].map("{:.0%}".format),
+            "Mediana": [medida(v, t) for v, t in zip(servicos["mediana"], servicos["tipo"])],
+            "P95": [medida(v, t) for v, t in zip(servicos["p95"], servicos["tipo"])],
+            "Jitter": [medida(v, t) if t in sondas.LATENCIAS else "—" for v, t in zip(servicos["jitter"], servicos["tipo"])],
+        }), hide_index=True)
+
+    equipamentos = resumo[resumo["rotulo"] != ""]
+    if len(equipamentos):
+        st.dataframe(pd.DataFrame({
+            "Equipamento": equipamentos["rotulo"],
+            "Endereço": equipamentos["alvo"],
+            "Disponibilidade": (1 - equipamentos["perda"]).map("{:.0%}".format),
+            "Latência mediana": [medida(v, t) for v, t in zip(equipamentos["mediana"], equipamentos["tipo"])],
+            "Jitter": [medida(v, t) for v, t in zip(equipamentos["jitter"], equipamentos["tipo"])],
+            "Último contato": equipamentos["ultimo_ms"].map(ultimo),
+            "Última falha": equipamentos["ultimo_erro"].fillna("—"),
+        }), hide_index=True)
+
+    if df["tipo"].isin(sondas.LATENCIAS).any():
+        fig = graficos.em_cache(("latencias", conjunto.id, versao(conjunto), inicio, fim),
+                                lambda: graficos.grafico_latencias(df))
+        with diagnostico.trecho("st.plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+
+
+def secao_conjunto(conjunto):
+    texto = TEXTOS.get(conjunto.id, {})
+
+    st.title(conjunto.titulo)
+    if "descricao" in texto:
+        st.markdown(texto["descricao"])
+
+    caminho = serie_temporal.sincronizar(conjunto)
+    inicio, fim = periodo_visivel(caminho, conjunto)
+    dados = serie_temporal.consultar(conjunto.site, conjunto.rede, inicio, fim, caminho=caminho)
+    media = serie_temporal.media_do_periodo(dados)
+    agregado = incremental.do_conjunto(conjunto)
+    detectadas = anomalias.do_conjunto(conjunto)
+
+    col1, col2 = st.columns(2)
+    destacar = col1.toggle("🚨 Destacar anomalias", value=True, key=f"anomalias-{conjunto.id}")
+    uso = col2.selectbox("Comparar com o recomendado para", list(detectadas.abaixo), index=None,
+                         placeholder="Nenhum uso", key=f"uso-{conjunto.id}")
+
+    titulo = f"Variação da Velocidade de Download - {conjunto.rede}"
+
+    def construir():
+        fig = graficos.grafico_download(dados, titulo, media)
+        if destacar or uso is not None:
+            graficos.sobrepor_anomalias(fig, detectadas, inicio, fim, uso, eventos=destacar)
+        return fig
+
+    fig = graficos.em_cache(("download", conjunto.id, versao(conjunto), inicio, fim, titulo, destacar, uso), construir)
+
+    with diagnostico.trecho("st.plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.metric(label=f"📊 Média de Download ({conjunto.rede})", value=f"{media:.2f} Mbps")
+    quadro_anomalias(detectadas, inicio, fim, uso)
+    quadro_estatisticas(conjunto, agregado)
+    quadro_sondagens(caminho, conjunto, inicio, fim)
+
+    if "analise" in texto:
+        st.subheader(texto["subtitulo"])
+        st.markdown(texto["analise"])
+
+
+def secao_comparativo(conjuntos):
+    st.title("Comparativo")
+
+    escolhidos = st.multiselect(
+        "Redes comparadas",
+        conjuntos,
+        default=conjuntos[:2],
+        format_func=lambda c: c.rotulo,
+    )
+    if not escolhidos:
+        return
+
+    # As médias saem dos resumos do armazém; a série inteira só é lida para montar o gráfico
+    colunas = st.columns(len(escolhidos))
+    for conjunto, coluna in zip(escolhidos, colunas):
+        caminho = serie_temporal.sincronizar(conjunto)
+        media = serie_temporal.media_do_periodo(serie_temporal.consultar(conjunto.site, conjunto.rede, caminho=caminho))
+        coluna.metric(label=f"📊 Média ({conjunto.rede})", value=f"{media:.2f} Mbps")
+
+    chave = ("comparativo", tuple((c.id, versao(c)) for c in escolhidos))
+    fig = graficos.em_cache(chave, lambda: graficos.grafico_comparativo(escolhidos, carregar_conjunto))
+    with diagnostico.trecho("st.plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
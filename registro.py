@@ -0,0 +1,161 @@
+import json
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+
+ARQUIVO_REGISTRO = "conjuntos.json"
+
+# Séries de pastas registradas, uma versão por pasta (quando a versão muda, a cópia anterior
+# sai da memória, como em dados.carregar), e os acumuladores dos bancos do coletor
+_memoria = {}
+_trava = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Conjunto:
+    id: str
+    site: str
+    rede: str
+    titulo: str
+    periodo: str
+    arquivo: str
+
+    @property
+    def rotulo(self):
+        return f"{self.titulo} ({self.periodo})"
+
+
+class Registro:
+    # Guarda só os metadados; os dados de cada conjunto são lidos sob demanda em carregar()
+    def __init__(self, conjuntos):
+        self.conjuntos = list(conjuntos)
+        self._por_id = {c.id: c for c in self.conjuntos}
+        self._por_site = {}
+        for conjunto in self.conjuntos:
+            self._por_site.setdefault(conjunto.site, []).append(conjunto)
+
+    def sites(self):
+        return list(self._por_site)
+
+    def do_site(self, site):
+        return list(self._por_site.get(site, []))
+
+    def obter(self, id):
+        return self._por_id[id]
+
+    def filtrar(self, site=None, rede=None, periodo=None):
+        base = self.conjuntos if site is None else self._por_site.get(site, [])
+        return [
+            c for c in base
+            if (rede is None or c.rede == rede) and (periodo is None or c.periodo == periodo)
+        ]
+
+
+@lru_cache(maxsize=4)
+def _ler_registro(caminho, mtime_ns):
+    with open(caminho, encoding="utf-8") as arquivo:
+        entradas = json.load(arquivo)
+    return Registro(Conjunto(**entrada) for entrada in entradas)
+
+
+def registro(caminho=ARQUIVO_REGISTRO):
+    return _ler_registro(caminho, Path(caminho).stat().st_mtime_ns)
+
+
+def versao(conjunto):
+    # Muda sempre que o conteúdo do conjunto muda; serve de chave para caches derivados
+    caminho = Path(conjunto.arquivo)
+    if caminho.suffix == ".sqlite":
+        wal = caminho.with_name(caminho.name + "-wal")
+        partes = [caminho] + ([wal] if wal.exists() else [])
+        return tuple((p.stat().st_mtime_ns, p.stat().st_size) for p in partes)
+
+    from dados import versao as versao_planilha
+    if caminho.is_dir():
+        from ingestao import descobrir
+        return tuple(versao_planilha(c) for c in descobrir(caminho))
+    return versao_planilha(conjunto.arquivo)
+
+
+def _carregar_pasta(caminho, versao_pasta):
+    from compacto import de_dataframe
+    from ingestao import ingerir
+
+    with _trava:
+        guardada = _memoria.get(caminho)
+    if guardada and guardada[0] == versao_pasta:
+        return guardada[1]
+    df, _ = ingerir((origem for origem, _, _ in versao_pasta), inicio_processos="spawn")
+    serie = de_dataframe(df)
+    with _trava:
+        _memoria[caminho] = (versao_pasta, serie)
+    return serie
+
+
+@dataclass
+class _Banco:
+    acumulador: object
+    trava: threading.Lock = field(default_factory=threading.Lock)
+    versao: tuple = None
+    marca: int = 0
+
+
+def _carregar_banco(conjunto, versao_banco):
+    # O banco do coletor só recebe INSERTs: numa versão nova, lê só as linhas além do último
+    # id já lido e as anexa ao acumulador, sem recopiar o histórico
+    from compacto import Acumulador
+    from serie_temporal import amostras_desde
+
+    chave = (conjunto.arquivo, conjunto.site, conjunto.rede)
+    with _trava:
+        if chave not in _memoria:
+            _memoria[chave] = _Banco(Acumulador(conjunto.site, conjunto.rede))
+        banco = _memoria[chave]
+    with banco.trava:
+        if banco.versao != versao_banco:
+            ids, instantes, valores = amostras_desde(conjunto.arquivo, conjunto.site, conjunto.rede, banco.marca)
+            banco.acumulador.anexar(instantes, valores)
+            banco.marca = int(ids[-1]) if len(ids) else banco.marca
+            banco.versao = versao_banco
+        return banco.acumulador.serie()
+
+
+def carregar(conjunto):
+    # Sempre uma compacto.SerieCompacta de uma rede só, ordenada pelo instante
+    caminho = Path(conjunto.arquivo)
+    if caminho.suffix == ".sqlite":
+        return _carregar_banco(conjunto, versao(conjunto))
+
+    # Uma pasta registrada reúne todas as exportações diárias dela num único conjunto
+    if caminho.is_dir():
+        serie = _carregar_pasta(conjunto.arquivo, versao(conjunto))
+    else:
+        from dados import carregar as carregar_planilha
+        serie = carregar_planilha(conjunto.arquivo)
+    return serie.rotular(conjunto.site, conjunto.rede)
+
+
+def _assinatura(serie, linha):
+    # Bytes do valor, não o float: NaN (falha de medição) nunca é igual a si mesmo
+    return (int(serie.instantes_ms[linha]), serie.valores[linha].tobytes())
+
+
+def carregar_desde(conjunto, marca, assinatura):
+    # Devolve (amostras novas, nova marca, nova assinatura, reescrito). Para o banco do coletor
+    # a marca é o último id lido; para planilhas, o número de amostras já processadas, e a
+    # assinatura (última amostra processada) detecta arquivos reescritos por inteiro. As
+    # amostras novas de planilhas são uma fatia da série em memória, sem cópia
+    if Path(conjunto.arquivo).suffix == ".sqlite":
+        from compacto import de_arrays
+        from serie_temporal import amostras_desde
+        ids, instantes, valores = amostras_desde(conjunto.arquivo, conjunto.site, conjunto.rede, marca)
+        novos = de_arrays(instantes, valores, conjunto.site, conjunto.rede)
+        return novos, int(ids[-1]) if len(ids) else marca, None, False
+
+    serie = carregar(conjunto)
+    if marca and (len(serie) < marca or _assinatura(serie, marca - 1) != assinatura):
+        return serie[0:0], 0, None, True
+    assinatura = _assinatura(serie, -1) if len(serie) else None
+    return serie[marca:], len(serie), assinatura, False
@@ -0,0 +1,299 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import diagnostico
+
+
+# Instantes são guardados como milissegundos do horário local de parede desde 1970-01-01,
+# sem fuso: é assim que as planilhas e o coletor registram a hora dos testes
+EPOCA = datetime(1970, 1, 1)
+# Um armazém local por conjunto de planilhas: as consultas filtram só por site e rede, e
+# conjuntos do mesmo site e rede em períodos diferentes não podem se misturar
+PASTA_ARMAZENS = Path(".cache") / "series"
+
+# Resumos mantidos por gatilho a cada INSERT; consultas com resolução de pelo menos um
+# desses passos leem o resumo em vez das amostras brutas
+PASSOS_RESUMO_S = (60, 3600, 86400)
+
+GATILHO_RESUMOS = f"""
+CREATE TRIGGER IF NOT EXISTS amostras_resumos AFTER INSERT ON amostras BEGIN
+    INSERT INTO resumos (site, rede, passo_s, balde_ms, amostras, validas, soma, minimo, maximo)
+    SELECT NEW.site, NEW.rede, p.passo_s, NEW.instante_ms - NEW.instante_ms % (p.passo_s * 1000), 1,
+           NEW.download_mbps IS NOT NULL, COALESCE(NEW.download_mbps, 0), NEW.download_mbps, NEW.download_mbps
+    FROM ({" UNION ALL ".join(f"SELECT {p} AS passo_s" for p in PASSOS_RESUMO_S)}) AS p WHERE true
+    ON CONFLICT (site, rede, passo_s, balde_ms) DO UPDATE SET
+        amostras = amostras + 1,
+        validas = validas + excluded.validas,
+        soma = soma + excluded.soma,
+        minimo = MIN(COALESCE(minimo, excluded.minimo), COALESCE(excluded.minimo, minimo)),
+        maximo = MAX(COALESCE(maximo, excluded.maximo), COALESCE(excluded.maximo, maximo));
+END;
+"""
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS amostras (
+    id INTEGER PRIMARY KEY,
+    instante_ms INTEGER NOT NULL,
+    site TEXT NOT NULL,
+    rede TEXT NOT NULL,
+    alvo TEXT NOT NULL,
+    download_mbps REAL
+);
+CREATE INDEX IF NOT EXISTS amostras_site_rede_instante ON amostras (site, rede, instante_ms);
+
+CREATE TABLE IF NOT EXISTS resumos (
+    site TEXT NOT NULL,
+    rede TEXT NOT NULL,
+    passo_s INTEGER NOT NULL,
+    balde_ms INTEGER NOT NULL,
+    amostras INTEGER NOT NULL,
+    validas INTEGER NOT NULL,
+    soma REAL NOT NULL,
+    minimo REAL,
+    maximo REAL,
+    PRIMARY KEY (site, rede, passo_s, balde_ms)
+) WITHOUT ROWID;
+
+{GATILHO_RESUMOS}
+
+-- Sondas de latência (ms), transferência (Mbps) e alcance dos equipamentos (sondas.py);
+-- valor NULL é sondagem que falhou, com o motivo em erro
+CREATE TABLE IF NOT EXISTS sondagens (
+    id INTEGER PRIMARY KEY,
+    instante_ms INTEGER NOT NULL,
+    site TEXT NOT NULL,
+    rede TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    alvo TEXT NOT NULL,
+    rotulo TEXT NOT NULL DEFAULT '',
+    valor REAL,
+    erro TEXT
+);
+CREATE INDEX IF NOT EXISTS sondagens_site_rede_instante ON sondagens (site, rede, instante_ms);
+
+CREATE TABLE IF NOT EXISTS versoes (
+    conjunto TEXT PRIMARY KEY,
+    versao TEXT NOT NULL
+);
+"""
+
+LINHAS_POR_BLOCO = 65536
+
+_conexoes = {}
+_trava = threading.Lock()
+
+
+def para_ms(instante):
+    return int((pd.Timestamp(instante).to_pydatetime() - EPOCA) / timedelta(milliseconds=1))
+
+
+def agora_ms():
+    return para_ms(datetime.now())
+
+
+def conectar(caminho):
+    # Uma conexão por arquivo, compartilhada entre as sessões; o WAL deixa o coletor
+    # gravar enquanto o painel lê
+    caminho = str(caminho)
+    with _trava:
+        if caminho not in _conexoes:
+            Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+            conexao = sqlite3.connect(caminho, check_same_thread=False)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            preparar(conexao)
+            _conexoes[caminho] = (conexao, threading.Lock())
+        return _conexoes[caminho]
+
+
+def preparar(conexao):
+    # Aplica o esquema. Bancos gravados antes dos resumos ganham a tabela vazia e o gatilho,
+    # que só soma as amostras novas: as séries ainda sem resumo são resumidas aqui, uma vez
+    conexao.executescript(ESQUEMA)
+    with conexao:
+        conexao.execute("BEGIN IMMEDIATE")
+        for site, rede in conexao.execute("SELECT DISTINCT site, rede FROM amostras").fetchall():
+            resumida = conexao.execute(
+                "SELECT 1 FROM resumos WHERE site = ? AND rede = ? AND passo_s = ? LIMIT 1",
+                (site, rede, max(PASSOS_RESUMO_S)),
+            ).fetchone()
+            if not resumida:
+                _refazer_resumos(conexao, site, rede)
+
+
+def armazem_do_conjunto(conjunto):
+    # O banco do coletor já é um armazém; planilhas e pastas são copiadas para o armazém
+    # local do conjunto
+    if Path(conjunto.arquivo).suffix == ".sqlite":
+        return conjunto.arquivo
+    return PASTA_ARMAZENS / f"{conjunto.id}.sqlite"
+
+
+def sincronizar(conjunto):
+    from registro import carregar, versao
+
+    caminho = armazem_do_conjunto(conjunto)
+    if caminho == conjunto.arquivo:
+        return caminho
+
+    atual = repr(versao(conjunto))
+    conexao, trava = conectar(caminho)
+    with trava:
+        linha = conexao.execute("SELECT versao FROM versoes WHERE conjunto = ?", (conjunto.id,)).fetchone()
+    diagnostico.cache("serie.sincronizar", bool(linha and linha[0] == atual))
+    if linha and linha[0] == atual:
+        return caminho
+
+    with diagnostico.trecho("serie.importar", conjunto=conjunto.id) as info:
+        serie = carregar(conjunto)
+        importar_em_lote(caminho, conjunto.site, conjunto.rede, conjunto.id, serie.instantes_ms, serie.valores, substituir=True)
+        info["linhas"] = len(serie)
+    with trava, conexao:
+        conexao.execute("INSERT OR REPLACE INTO versoes (conjunto, versao) VALUES (?, ?)", (conjunto.id, atual))
+    return caminho
+
+
+def importar_em_lote(caminho, site, rede, alvo, instantes_ms, valores, substituir=False):
+    # Para cargas grandes o gatilho (três upserts por linha) é desligado durante o INSERT e os
+    # resumos da série são refeitos de uma vez com GROUP BY
+    linhas = (
+        (int(t), site, rede, alvo, None if v != v else float(v))
+        for t, v in zip(instantes_ms, valores)
+    )
+    conexao, trava = conectar(caminho)
+    with trava:
+        with conexao:
+            # Transação explícita: a troca do gatilho fica invisível para outros gravadores
+            conexao.execute("BEGIN IMMEDIATE")
+            if substituir:
+                conexao.execute("DELETE FROM amostras WHERE site = ? AND rede = ? AND alvo = ?", (site, rede, alvo))
+            conexao.execute("DROP TRIGGER IF EXISTS amostras_resumos")
+            conexao.executemany(
+                "INSERT INTO amostras (instante_ms, site, rede, alvo, download_mbps) VALUES (?, ?, ?, ?, ?)",
+                linhas,
+            )
+            _refazer_resumos(conexao, site, rede)
+            conexao.execute(GATILHO_RESUMOS)
+
+
+def _refazer_resumos(conexao, site, rede):
+    # O gatilho só soma; depois de apagar amostras, os resumos da série são reconstruídos
+    conexao.execute("DELETE FROM resumos WHERE site = ? AND rede = ?", (site, rede))
+    for passo in PASSOS_RESUMO_S:
+        conexao.execute(
+            """
+            INSERT INTO resumos (site, rede, passo_s, balde_ms, amostras, validas, soma, minimo, maximo)
+            SELECT site, rede, ?, instante_ms - instante_ms % ?, COUNT(*), COUNT(download_mbps),
+                   COALESCE(SUM(download_mbps), 0), MIN(download_mbps), MAX(download_mbps)
+            FROM amostras WHERE site = ? AND rede = ?
+            GROUP BY 1, 2, 4
+            """,
+            (passo, passo * 1000, site, rede),
+        )
+
+
+def extensao(caminho, site, rede):
+    # Primeiro e último instante pelo índice e total de amostras pelos resumos diários
+    conexao, trava = conectar(caminho)
+    with trava:
+        # MIN e MAX em consultas separadas: assim cada um vira uma única busca no índice
+        inicio, = conexao.execute("SELECT MIN(instante_ms) FROM amostras WHERE site = ? AND rede = ?", (site, rede)).fetchone()
+        fim, = conexao.execute("SELECT MAX(instante_ms) FROM amostras WHERE site = ? AND rede = ?", (site, rede)).fetchone()
+        total, = conexao.execute(
+            "SELECT COALESCE(SUM(amostras), 0) FROM resumos WHERE site = ? AND rede = ? AND passo_s = ?",
+            (site, rede, max(PASSOS_RESUMO_S)),
+        ).fetchone()
+    if inicio is None:
+        return None, None, 0
+    return EPOCA + timedelta(milliseconds=inicio), EPOCA + timedelta(milliseconds=fim), total
+
+
+def amostras_desde(caminho, site, rede, desde_id=0):
+    # Amostras brutas além de desde_id como arrays (ids, instantes_ms, valores), sem pandas.
+    # O cursor é lido em blocos: só um bloco de tuplas existe de cada vez. "+site" e "+rede"
+    # tiram o índice da série do plano: a busca vai pelo id, sem varrer a série nem ordenar
+    conexao, trava = conectar(caminho)
+    blocos = []
+    with trava:
+        cursor = conexao.execute(
+            "SELECT id, instante_ms, download_mbps FROM amostras WHERE +site = ? AND +rede = ? AND id > ? ORDER BY id",
+            (site, rede, desde_id),
+        )
+        while linhas := cursor.fetchmany(LINHAS_POR_BLOCO):
+            # float64 representa ids e instantes em ms sem perda; None vira NaN
+            blocos.append(np.array(linhas, dtype='float64'))
+    matriz = np.concatenate(blocos) if blocos else np.empty((0, 3))
+    return matriz[:, 0].astype('int64'), matriz[:, 1].astype('int64'), matriz[:, 2].copy()
+
+
+def _resolucao_automatica(inicio_ms, fim_ms, pontos):
+    return max(1, (fim_ms - inicio_ms) // 1000 // max(pontos, 1))
+
+
+def consultar(site, rede, inicio=None, fim=None, resolucao="auto", *, caminho, pontos=None):
+    # resolucao em segundos; None devolve as amostras brutas e "auto" escolhe o passo que
+    # rende no máximo `pontos` baldes no intervalo
+    from amostragem import PONTOS_PADRAO
+
+    conexao, trava = conectar(caminho)
+    if inicio is None or fim is None:
+        primeiro, ultimo, _ = extensao(caminho, site, rede)
+        inicio = inicio if inicio is not None else primeiro
+        fim = fim if fim is not None else ultimo
+    if inicio is None:
+        return pd.DataFrame(columns=['Timestamp', 'Download (Mbps)', 'minimo', 'maximo', 'amostras', 'validas', 'soma'])
+    inicio_ms, fim_ms = para_ms(inicio), para_ms(fim)
+
+    if resolucao == "auto":
+        resolucao = _resolucao_automatica(inicio_ms, fim_ms, pontos or PONTOS_PADRAO)
+    passos = [p for p in PASSOS_RESUMO_S if resolucao is not None and p <= resolucao]
+
+    if not passos and resolucao is not None and resolucao > 1:
+        # Abaixo do menor resumo, agrupa as amostras brutas no próprio SQLite
+        sql = """
+            SELECT instante_ms - instante_ms % ? AS balde, AVG(download_mbps), MIN(download_mbps), MAX(download_mbps),
+                   COUNT(*), COUNT(download_mbps), COALESCE(SUM(download_mbps), 0)
+            FROM amostras
+            WHERE site = ? AND rede = ? AND instante_ms BETWEEN ? AND ?
+            GROUP BY balde
+            ORDER BY balde
+        """
+        parametros = (int(resolucao * 1000), site, rede, inicio_ms, fim_ms)
+    elif not passos:
+        sql = """
+            SELECT instante_ms AS balde_ms, download_mbps AS media, download_mbps AS minimo, download_mbps AS maximo,
+                   1 AS amostras, download_mbps IS NOT NULL AS validas, COALESCE(download_mbps, 0) AS soma
+            FROM amostras
+            WHERE site = ? AND rede = ? AND instante_ms BETWEEN ? AND ?
+            ORDER BY instante_ms
+        """
+        parametros = (site, rede, inicio_ms, fim_ms)
+    else:
+        passo_ms = int(resolucao * 1000)
+        sql = """
+            SELECT balde_ms - balde_ms % ? AS balde, SUM(soma) / NULLIF(SUM(validas), 0), MIN(minimo), MAX(maximo),
+                   SUM(amostras), SUM(validas), SUM(soma)
+            FROM resumos
+            WHERE site = ? AND rede = ? AND passo_s = ? AND balde_ms BETWEEN ? AND ?
+            GROUP BY balde
+            ORDER BY balde
+        """
+        parametros = (passo_ms, site, rede, max(passos), inicio_ms - inicio_ms % (max(passos) * 1000), fim_ms)
+
+    with diagnostico.trecho("serie.consultar", rede=rede, resolucao_s=resolucao) as info, trava:
+        linhas = conexao.execute(sql, parametros).fetchall()
+        info["linhas"] = len(linhas)
+
+    df = pd.DataFrame(linhas, columns=['balde_ms', 'Download (Mbps)', 'minimo', 'maximo', 'amostras', 'validas', 'soma'])
+    df.insert(0, 'Timestamp', pd.Timestamp(EPOCA) + pd.to_timedelta(df.pop('balde_ms'), unit='ms'))
+    return df.astype({'Download (Mbps)': 'float64', 'minimo': 'float64', 'maximo': 'float64', 'soma': 'float64'})
+
+
+def media_do_periodo(df):
+    validas = df['validas'].sum()
+    return df['soma'].sum() / validas if validas else float('nan')
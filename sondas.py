@@ -0,0 +1,546 @@
+import argparse
+import asyncio
+import os
+import random
+import re
+import socket
+import ssl
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from coletor import BANCO_PADRAO, REDE_PADRAO, SITE_PADRAO, ArmazemSQLite
+from serie_temporal import EPOCA, agora_ms
+
+
+TIPOS = ("icmp", "tcp", "http", "upload")
+LATENCIAS = ("icmp", "tcp")
+# Tipos do inventário que respondem na rede; fontes, conversores e computadores ficam de fora
+TIPOS_EM_REDE = ("Access Point", "Impressora", "Roteador")
+TEMPO_LIMITE = 3.0
+BYTES_HTTP = 256 * 1024
+BYTES_UPLOAD = 256 * 1024
+MAX_BYTES_LOCAL = 64 * 2**20
+BLOCO = 64 * 1024
+
+# Endpoints públicos usados quando nenhuma sonda é informada na linha de comando
+SONDAS_PADRAO = (
+    ("icmp", "1.1.1.1"),
+    ("tcp", "1.1.1.1:443"),
+    ("http", f"https://speed.cloudflare.com/__down?bytes={BYTES_HTTP}"),
+    ("upload", "https://speed.cloudflare.com/__up"),
+)
+
+
+@dataclass(frozen=True)
+class Sonda:
+    # alvo: host (icmp), host:porta (tcp) ou URL (http, upload). rotulo identifica o
+    # equipamento do inventário nas sondas de alcance por dispositivo
+    tipo: str
+    alvo: str
+    rotulo: str = ""
+
+
+@dataclass
+class Sondagem:
+    instante_ms: int
+    site: str
+    rede: str
+    tipo: str
+    alvo: str
+    rotulo: str
+    valor: float | None  # ms nas latências, Mbps nas transferências; None quando falhou
+    erro: str | None = None
+
+
+def _host_porta(alvo):
+    host, _, porta = alvo.rpartition(":")
+    if not host or not porta.isdigit():
+        raise ValueError(f"alvo TCP sem porta: '{alvo}'")
+    return host.strip("[]"), int(porta)
+
+
+# ICMP -----------------------------------------------------------------------------------
+
+def _soma_verificacao(pacote):
+    if len(pacote) % 2:
+        pacote += b"\0"
+    soma = sum(struct.unpack(f"!{len(pacote) // 2}H", pacote))
+    soma = (soma >> 16) + (soma & 0xFFFF)
+    soma += soma >> 16
+    return ~soma & 0xFFFF
+
+
+def _socket_icmp():
+    # Socket ICMP sem privilégio (Linux com net.ipv4.ping_group_range, macOS) ou bruto (root).
+    # None quando nenhum dos dois é permitido
+    for tipo in (socket.SOCK_DGRAM, socket.SOCK_RAW):
+        try:
+            sock = socket.socket(socket.AF_INET, tipo, socket.IPPROTO_ICMP)
+        except (PermissionError, OSError):
+            continue
+        sock.setblocking(False)
+        return sock
+    return None
+
+
+async def _eco_icmp(sock, endereco, tempo_limite):
+    loop = asyncio.get_running_loop()
+    identificador, sequencia = random.randrange(1 << 16), random.randrange(1 << 16)
+    cabecalho = struct.pack("!BBHHH", 8, 0, 0, identificador, sequencia)
+    carga = b"relatorio" + os.urandom(23)
+    pacote = struct.pack("!BBHHH", 8, 0, _soma_verificacao(cabecalho + carga), identificador, sequencia) + carga
+    bruto = sock.type == socket.SOCK_RAW
+
+    async def aguardar_resposta():
+        while True:
+            resposta = await loop.sock_recv(sock, 2048)
+            if bruto:
+                # O socket bruto entrega o cabeçalho IP e todos os pacotes ICMP da máquina
+                resposta = resposta[(resposta[0] & 0x0F) * 4:]
+            tipo, _, _, recebido_id, recebida_seq = struct.unpack("!BBHHH", resposta[:8])
+            # No socket sem privilégio o kernel troca o identificador: vale só a sequência
+            if tipo == 0 and recebida_seq == sequencia and (not bruto or recebido_id == identificador):
+                return
+
+    inicio = time.perf_counter()
+    await loop.sock_sendto(sock, pacote, (endereco, 0))
+    await asyncio.wait_for(aguardar_resposta(), tempo_limite)
+    return (time.perf_counter() - inicio) * 1000
+
+
+async def _ping_externo(endereco, tempo_limite):
+    # Último recurso: o comando ping do sistema (não precisa de privilégio)
+    if sys.platform == "win32":
+        argumentos = ["ping", "-n", "1", "-w", str(int(tempo_limite * 1000)), endereco]
+    elif sys.platform == "darwin":
+        argumentos = ["ping", "-c", "1", "-W", str(int(tempo_limite * 1000)), endereco]
+    else:
+        argumentos = ["ping", "-c", "1", "-W", str(max(1, round(tempo_limite))), endereco]
+    try:
+        processo = await asyncio.create_subprocess_exec(
+            *argumentos, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+    except FileNotFoundError:
+        raise OSError("ICMP indisponível: sem permissão para sockets ICMP e sem o comando ping") from None
+    saida, _ = await processo.communicate()
+    tempo = re.search(r"[=<]\s*([\d.,]+)\s*ms", saida.decode(errors="replace"))
+    if processo.returncode != 0 or not tempo:
+        raise OSError("sem resposta ao ping")
+    return float(tempo.group(1).replace(",", "."))
+
+
+async def latencia_icmp(host, tempo_limite=TEMPO_LIMITE):
+    loop = asyncio.get_running_loop()
+    endereco = (await loop.getaddrinfo(host, None, family=socket.AF_INET))[0][4][0]
+    sock = _socket_icmp()
+    if sock is None:
+        return await _ping_externo(endereco, tempo_limite)
+    with sock:
+        return await _eco_icmp(sock, endereco, tempo_limite)
+
+
+# TCP e HTTP -----------------------------------------------------------------------------
+
+async def latencia_tcp(alvo, tempo_limite=TEMPO_LIMITE):
+    # Tempo do handshake (inclui a resolução de nome na primeira vez, que o SO guarda em cache)
+    host, porta = _host_porta(alvo)
+    inicio = time.perf_counter()
+    _, escritor = await asyncio.wait_for(asyncio.open_connection(host, porta), tempo_limite)
+    duracao = (time.perf_counter() - inicio) * 1000
+    escritor.close()
+    return duracao
+
+
+async def _ler_cabecalhos(leitor):
+    cabecalhos = {}
+    while True:
+        linha = await leitor.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            return cabecalhos
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        cabecalhos[nome.strip().lower()] = valor.strip()
+
+
+async def _ler_resposta(leitor):
+    # Devolve (status, bytes do corpo, conexão reaproveitável); o corpo é descartado
+    linha = await leitor.readline()
+    if not linha:
+        raise ConnectionResetError("conexão encerrada pelo servidor")
+    partes = linha.split(None, 2)
+    if len(partes) < 2 or not partes[0].startswith(b"HTTP/") or not partes[1].isdigit():
+        raise ValueError(f"resposta HTTP inválida: {linha[:60]!r}")
+    status = int(partes[1])
+    cabecalhos = await _ler_cabecalhos(leitor)
+    recebidos, reaproveitavel = 0, cabecalhos.get("connection", "").lower() != "close"
+
+    if status in (204, 304) or 100 <= status < 200:
+        pass
+    elif cabecalhos.get("transfer-encoding", "").lower() == "chunked":
+        while tamanho := int((await leitor.readline()).split(b";")[0], 16):
+            recebidos += len(await leitor.readexactly(tamanho))
+            await leitor.readexactly(2)
+        await _ler_cabecalhos(leitor)
+    elif "content-length" in cabecalhos:
+        restante = int(cabecalhos["content-length"])
+        while restante:
+            bloco = await leitor.read(min(restante, BLOCO))
+            if not bloco:
+                raise asyncio.IncompleteReadError(b"", restante)
+            recebidos += len(bloco)
+            restante -= len(bloco)
+    else:
+        # Sem tamanho declarado, o corpo vai até o servidor fechar a conexão
+        while bloco := await leitor.read(BLOCO):
+            recebidos += len(bloco)
+        reaproveitavel = False
+    return status, recebidos, reaproveitavel
+
+
+class ConexoesHTTP:
+    # Conexões HTTP/1.1 keep-alive por (esquema, host, porta), reaproveitadas entre sondas e
+    # rodadas: o handshake TCP/TLS fica fora das medições seguintes. No máximo max_por_host
+    # requisições simultâneas por servidor
+    def __init__(self, max_por_host=2, tempo_limite=TEMPO_LIMITE):
+        self.max_por_host = max_por_host
+        self.tempo_limite = tempo_limite
+        self._livres = {}
+        self._limites = {}
+        self._tls = None
+        self.abertas = 0
+
+    async def _conectar(self, esquema, host, porta):
+        if esquema == "https" and self._tls is None:
+            self._tls = ssl.create_default_context()
+        self.abertas += 1
+        return await asyncio.open_connection(host, porta, ssl=self._tls if esquema == "https" else None)
+
+    @staticmethod
+    async def _trocar(leitor, escritor, cabecalho, corpo):
+        inicio = time.perf_counter()
+        escritor.write(cabecalho)
+        if isinstance(corpo, int):
+            # Upload sintético: zeros enviados em blocos, sem montar o corpo inteiro
+            bloco = bytes(min(corpo, BLOCO))
+            for enviado in range(0, corpo, BLOCO):
+                escritor.write(bloco[:corpo - enviado])
+                await escritor.drain()
+        else:
+            escritor.write(corpo)
+        await escritor.drain()
+        status, recebidos, reaproveitavel = await _ler_resposta(leitor)
+        return status, recebidos, reaproveitavel, time.perf_counter() - inicio
+
+    async def requisitar(self, metodo, url, corpo=b""):
+        # Devolve (status, bytes recebidos, segundos); corpo pode ser bytes ou um tamanho em bytes
+        partes = urlsplit(url)
+        porta = partes.port or (443 if partes.scheme == "https" else 80)
+        chave = (partes.scheme, partes.hostname, porta)
+        caminho = (partes.path or "/") + (f"?{partes.query}" if partes.query else "")
+        tamanho = corpo if isinstance(corpo, int) else len(corpo)
+        cabecalho = (
+            f"{metodo} {caminho} HTTP/1.1\r\nHost: {partes.netloc}\r\nUser-Agent: relatorio-sondas\r\n"
+            f"Accept-Encoding: identity\r\nConnection: keep-alive\r\n"
+            + (f"Content-Type: application/octet-stream\r\nContent-Length: {tamanho}\r\n" if metodo == "POST" else "")
+            + "\r\n"
+        ).encode("latin-1")
+
+        limite = self._limites.setdefault(chave, asyncio.Semaphore(self.max_por_host))
+        async with limite:
+            livres = self._livres.setdefault(chave, [])
+            # Uma conexão ociosa pode ter sido fechada pelo servidor: nesse caso, uma nova tentativa
+            for reaproveitada in ([True, False] if livres else [False]):
+                if reaproveitada:
+                    leitor, escritor = livres.pop()
+                else:
+                    leitor, escritor = await asyncio.wait_for(self._conectar(*chave), self.tempo_limite)
+                try:
+                    status, recebidos, reaproveitavel, segundos = await asyncio.wait_for(
+                        self._trocar(leitor, escritor, cabecalho, corpo), self.tempo_limite
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    escritor.close()
+                    if reaproveitada:
+                        continue
+                    raise
+                except BaseException:
+                    escritor.close()
+                    raise
+                if reaproveitavel:
+                    livres.append((leitor, escritor))
+                else:
+                    escritor.close()
+                return status, recebidos, segundos
+
+    async def fechar(self):
+        escritores = [escritor for livres in self._livres.values() for _, escritor in livres]
+        self._livres.clear()
+        for escritor in escritores:
+            escritor.close()
+        await asyncio.gather(*(escritor.wait_closed() for escritor in escritores), return_exceptions=True)
+
+
+# Motor ----------------------------------------------------------------------------------
+
+class MotorSondas:
+    # Todas as sondas de uma rodada rodam juntas, limitadas por max_simultaneos; as de HTTP
+    # compartilham o pool de conexões. Como o Coletor: grava em lotes e agenda pelo relógio do loop
+    def __init__(self, sondas, armazem, site, rede, max_simultaneos=16, max_por_host=2,
+                 tempo_limite=TEMPO_LIMITE, bytes_upload=BYTES_UPLOAD):
+        self.sondas = list(sondas)
+        self.armazem = armazem
+        self.site = site
+        self.rede = rede
+        self.tempo_limite = tempo_limite
+        self.bytes_upload = bytes_upload
+        self.http = ConexoesHTTP(max_por_host, tempo_limite)
+        self._semaforo = asyncio.Semaphore(max_simultaneos)
+        self.gravadas = 0
+
+    async def _medir(self, sonda):
+        if sonda.tipo == "icmp":
+            return await latencia_icmp(sonda.alvo, self.tempo_limite)
+        if sonda.tipo == "tcp":
+            return await latencia_tcp(sonda.alvo, self.tempo_limite)
+        if sonda.tipo == "http":
+            status, recebidos, segundos = await self.http.requisitar("GET", sonda.alvo)
+        elif sonda.tipo == "upload":
+            status, _, segundos = await self.http.requisitar("POST", sonda.alvo, self.bytes_upload)
+            recebidos = self.bytes_upload
+        else:
+            raise ValueError(f"tipo de sonda desconhecido: {sonda.tipo}")
+        if status >= 400:
+            raise OSError(f"HTTP {status}")
+        return recebidos * 8 / segundos / 1_000_000
+
+    async def _sondar(self, sonda):
+        async with self._semaforo:
+            # Como no Coletor, qualquer falha vira uma sondagem com erro: uma resposta estranha
+            # de um alvo não pode derrubar a rodada nem o motor
+            try:
+                valor, erro = await self._medir(sonda), None
+            except Exception as falha:
+                valor, erro = None, f"{type(falha).__name__}: {falha}" if str(falha) else type(falha).__name__
+        return Sondagem(agora_ms(), self.site, self.rede, sonda.tipo, sonda.alvo, sonda.rotulo, valor, erro)
+
+    async def rodada(self):
+        sondagens = await asyncio.gather(*(self._sondar(sonda) for sonda in self.sondas))
+        instante = (EPOCA + timedelta(milliseconds=sondagens[0].instante_ms)).strftime("%Y-%m-%d %H:%M:%S") if sondagens else ""
+        for s in sondagens:
+            unidade = "ms" if s.tipo in LATENCIAS else "Mbps"
+            valor = f"falhou ({s.erro})" if s.valor is None else f"{s.valor:.2f} {unidade}"
+            print(f"{instante} {s.tipo:6s} {s.rotulo or s.alvo}: {valor}")
+        self.gravadas += await asyncio.to_thread(self.armazem.anexar_sondagens, sondagens)
+        return sondagens
+
+    async def executar(self, rodadas=None, intervalo=30.0):
+        loop = asyncio.get_running_loop()
+        proxima = loop.time()
+        feitas = 0
+        try:
+            while rodadas is None or feitas < rodadas:
+                await self.rodada()
+                feitas += 1
+                if rodadas is not None and feitas >= rodadas:
+                    break
+                proxima += intervalo
+                espera = proxima - loop.time()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+                else:
+                    proxima = loop.time()
+        finally:
+            await self.http.fechar()
+
+
+def sondas_do_inventario(site=None, substituto=None):
+    # Alcance por equipamento de rede em uso: ICMP para "endereco" sem porta, TCP com porta.
+    # Sem endereço cadastrado, o equipamento só é sondado contra o substituto (ServidorLocal)
+    from inventario import EM_USO, inventario
+
+    sondas = []
+    for equipamento in inventario().consultar(site=site, tipo=TIPOS_EM_REDE, status=EM_USO):
+        endereco = substituto or equipamento.endereco
+        if endereco:
+            tipo = "tcp" if re.search(r":\d+$", endereco) else "icmp"
+            # Sem filtro de site, modelos repetidos em sites diferentes precisam de rótulos distintos
+            rotulo = equipamento.nome if site else f"{equipamento.nome} ({equipamento.site})"
+            sondas.append(Sonda(tipo, endereco, rotulo))
+    return sondas
+
+
+class ServidorLocal:
+    # Substituto offline dos endpoints, como o BackendLocal do coletor: HTTP/1.1 com keep-alive
+    # em 127.0.0.1 (GET /bytes/<n>, POST /upload), e a mesma porta atende as sondas TCP
+    def __init__(self, atraso=0.0):
+        self.atraso = atraso
+        self.porta = None
+        self._servidor = None
+
+    async def iniciar(self):
+        self._servidor = await asyncio.start_server(self._atender, "127.0.0.1", 0)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        return self
+
+    async def _atender(self, leitor, escritor):
+        try:
+            while linha := await leitor.readline():
+                metodo, caminho, _ = linha.decode("latin-1").split(" ", 2)
+                cabecalhos = await _ler_cabecalhos(leitor)
+                restante = int(cabecalhos.get("content-length", 0))
+                while restante:
+                    restante -= len(await leitor.readexactly(min(restante, BLOCO)))
+                if self.atraso:
+                    await asyncio.sleep(self.atraso)
+
+                tamanho = re.fullmatch(r"/bytes/(\d+)", caminho)
+                if metodo == "GET" and tamanho:
+                    status, corpo = "200 OK", bytes(min(int(tamanho.group(1)), MAX_BYTES_LOCAL))
+                elif metodo == "POST" and caminho == "/upload":
+                    status, corpo = "200 OK", b"ok"
+                else:
+                    status, corpo = "404 Not Found", b""
+                escritor.write(f"HTTP/1.1 {status}\r\nContent-Length: {len(corpo)}\r\n\r\n".encode("latin-1") + corpo)
+                await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Conexão keep-alive ainda aberta quando o servidor é encerrado. Terminar a
+            # tarefa cancelada faria o asyncio registrar o cancelamento como erro
+            pass
+        finally:
+            escritor.close()
+
+    @property
+    def endereco(self):
+        return f"127.0.0.1:{self.porta}"
+
+    def sondas(self):
+        return [
+            Sonda("icmp", "127.0.0.1"),
+            Sonda("tcp", self.endereco),
+            Sonda("http", f"http://{self.endereco}/bytes/{BYTES_HTTP}"),
+            Sonda("upload", f"http://{self.endereco}/upload"),
+        ]
+
+    async def fechar(self):
+        self._servidor.close()
+        await self._servidor.wait_closed()
+
+
+# Leitura para o painel ------------------------------------------------------------------
+
+def ler(caminho, site, rede, inicio_ms=None, fim_ms=None):
+    # Sondagens do período em ordem cronológica, como DataFrame (só o painel usa)
+    import pandas as pd
+    from serie_temporal import conectar
+
+    conexao, trava = conectar(caminho)
+    with trava:
+        linhas = conexao.execute(
+            """
+            SELECT instante_ms, tipo, alvo, rotulo, valor, erro FROM sondagens
+            WHERE site = ? AND rede = ? AND instante_ms BETWEEN ? AND ?
+            ORDER BY instante_ms
+            """,
+            (site, rede, -2**63 if inicio_ms is None else inicio_ms, 2**63 - 1 if fim_ms is None else fim_ms),
+        ).fetchall()
+    return pd.DataFrame(linhas, columns=["instante_ms", "tipo", "alvo", "rotulo", "valor", "erro"])
+
+
+def resumir(df):
+    # Uma linha por (tipo, alvo, rótulo): testes, perda, mediana, P95, jitter e o último contato
+    import numpy as np
+    import pandas as pd
+
+    linhas = []
+    for (tipo, alvo, rotulo), grupo in df.groupby(["tipo", "alvo", "rotulo"], sort=False):
+        valores = grupo["valor"].to_numpy(dtype="float64")
+        validos = valores[~np.isnan(valores)]
+        sucesso = grupo.loc[grupo["valor"].notna(), "instante_ms"]
+        linhas.append({
+            "tipo": tipo,
+            "alvo": alvo,
+            "rotulo": rotulo,
+            "testes": len(valores),
+            "perda": 1 - len(validos) / len(valores),
+            "mediana": float(np.median(validos)) if len(validos) else np.nan,
+            "p95": float(np.percentile(validos, 95)) if len(validos) else np.nan,
+            # Variação média entre testes consecutivos do mesmo alvo (latências)
+            "jitter": float(np.mean(np.abs(np.diff(validos)))) if len(validos) > 1 else np.nan,
+            "ultimo_ms": int(sucesso.iloc[-1]) if len(sucesso) else None,
+            "ultimo_erro": grupo["erro"].dropna().iloc[-1] if grupo["erro"].notna().any() else None,
+        })
+    return pd.DataFrame(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sondas simultâneas de latência, transferência e alcance dos equipamentos")
+    parser.add_argument("--banco", default=BANCO_PADRAO)
+    parser.add_argument("--site", default=SITE_PADRAO)
+    parser.add_argument("--rede", default=REDE_PADRAO)
+    for tipo, ajuda in (("icmp", "host"), ("tcp", "host:porta"), ("http", "URL baixada por GET"), ("upload", "URL que recebe POST")):
+        parser.add_argument(f"--{tipo}", action="append", default=[], metavar=ajuda.split()[0].upper(), help=f"{ajuda} (pode repetir)")
+    parser.add_argument("--equipamentos", action="store_true", help="sonda os equipamentos de rede em uso do inventário")
+    # Os sites do inventário (Restaurante, ...) não são os do registro (Pousada): --site continua
+    # sendo o do registro, para as sondagens aparecerem no painel
+    parser.add_argument("--site-inventario", help="limita os equipamentos a um site do inventário; padrão: todos")
+    parser.add_argument("--intervalo", type=float, default=30.0, help="segundos entre rodadas")
+    parser.add_argument("--rodadas", type=int, default=None, help="padrão: roda até ser interrompido")
+    parser.add_argument("--simultaneos", type=int, default=16)
+    parser.add_argument("--por-host", type=int, default=2, help="requisições HTTP simultâneas por servidor")
+    parser.add_argument("--tempo-limite", type=float, default=TEMPO_LIMITE)
+    parser.add_argument("--bytes-upload", type=int, default=BYTES_UPLOAD)
+    parser.add_argument("--local", action="store_true",
+                        help="usa endpoints locais em 127.0.0.1 no lugar dos remotos e dos equipamentos")
+    args = parser.parse_args(argv)
+
+    sondas = [Sonda(tipo, alvo) for tipo in TIPOS for alvo in getattr(args, tipo)]
+    if not sondas and not args.local:
+        sondas = [Sonda(tipo, alvo) for tipo, alvo in SONDAS_PADRAO]
+    site_inventario = args.site_inventario
+
+    def do_inventario(substituto=None):
+        equipamentos = sondas_do_inventario(site_inventario, substituto)
+        if not equipamentos:
+            requisito = "" if substituto else " com endereço cadastrado"
+            onde = f"para o site '{site_inventario}'" if site_inventario else "em nenhum site"
+            print(f"Aviso: nenhum equipamento de rede em uso{requisito} no inventário {onde}; "
+                  f"nenhuma sonda de equipamento.", file=sys.stderr)
+        return equipamentos
+
+    if args.equipamentos and not args.local:
+        sondas += do_inventario()
+
+    armazem = ArmazemSQLite(args.banco)
+    motor = MotorSondas(sondas, armazem, args.site, args.rede, args.simultaneos, args.por_host,
+                        args.tempo_limite, args.bytes_upload)
+
+    async def executar():
+        # O servidor local precisa do loop rodando para saber a porta
+        servidor = await ServidorLocal().iniciar() if args.local else None
+        if servidor:
+            motor.sondas += servidor.sondas()
+            if args.equipamentos:
+                motor.sondas += do_inventario(servidor.endereco)
+        try:
+            await motor.executar(args.rodadas, args.intervalo)
+        finally:
+            if servidor:
+                await servidor.fechar()
+
+    print(f"Iniciando {len(sondas)} sondas..." if not args.local else "Iniciando as sondas locais...")
+    try:
+        asyncio.run(executar())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        armazem.fechar()
+    print(f"Sondas encerradas! {motor.gravadas} sondagens salvas em '{args.banco}'.")
+
+
+if __name__ == "__main__":
+    main()
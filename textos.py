@@ -0,0 +1,105 @@
+# Textos fixos do relatório, usados pela página e pela exportação estática
+
+INTRODUCAO = [
+    "A infraestrutura de rede da pousada apresentava diversos problemas que impactavam diretamente na experiência dos hóspedes e na operação interna. Entre os principais desafios estavam a baixa velocidade de conexão, instabilidade frequente, cobertura de sinal limitada e uma estrutura defasada, sem gerenciamento eficiente ou segurança adequada.",
+    "Com a chegada da nossa empresa, foi iniciado um processo de modernização completo da rede. Implementamos uma nova infraestrutura de internet, com equipamentos de alto desempenho, distribuição de sinal Wi-Fi otimizada para todas as áreas da pousada. O objetivo foi garantir uma conexão estável, rápida e segura, atendendo tanto às demandas operacionais quanto à expectativa dos hóspedes por uma internet de qualidade.",
+]
+
+METODOLOGIA = "Foram conduzidos testes de velocidade, registrando a taxa de download em Mbps. Os dados foram coletados por um Script e analisados para identificar oscilações na conexão e eventuais gargalos que impactavam a experiência dos usuários."
+
+COLETA = (
+    "Os testes são feitos pelo coletor (coletor.py), que roda continuamente: a cada rodada mede o "
+    "download em todos os servidores escolhidos ao mesmo tempo e grava as amostras em lotes num banco "
+    "SQLite (amostras.sqlite). Com os nomes de site e rede do registro, o banco pode ser adicionado "
+    "em conjuntos.json, como no exemplo abaixo, e aparece neste relatório enquanto a coleta continua."
+)
+
+COMANDO_COLETA = """\
+# uma rodada por minuto no melhor servidor (repita --alvo para medir vários servidores)
+python coletor.py --site "Pousada" --rede "Rede Nova" --intervalo 60
+# sem internet, com velocidades sintéticas
+python coletor.py --local --rodadas 5 --intervalo 1"""
+
+REGISTRO_COLETA = """\
+{
+    "id": "pousada-rede-nova-coletor",
+    "site": "Pousada",
+    "rede": "Rede Nova",
+    "titulo": "Nova rede (coleta contínua)",
+    "periodo": "2025-05",
+    "arquivo": "amostras.sqlite"
+}"""
+
+NOTA_VELOCIDADES = "Este quadro apresenta estimativas de velocidades ideais de internet (em Mbps) para diferentes tipos de uso."
+
+
+# Textos do relatório por conjunto de dados (chave = id em conjuntos.json)
+
+TEXTOS = {
+    "pousada-rede-antiga": {
+        "descricao": "Este relatório apresenta a análise do desempenho da internet utilizada anteriormente na pousada, com base em testes realizados para avaliar a estabilidade e a qualidade da conexão antes das melhorias implementadas na infraestrutura de rede.",
+        "subtitulo": "Análise Técnica – Rede Anterior",
+        "analise": """
+A estrutura de rede anteriormente utilizada na pousada apresentava sérias limitações técnicas que comprometiam tanto a operação interna quanto a experiência dos hóspedes. A seguir, destacam-se os principais pontos críticos identificados durante os testes de desempenho:
+
+#### Principais Problemas Detectados
+
+- **Baixa velocidade de conexão**  
+Em diversos momentos, a taxa de download ficou abaixo de níveis considerados aceitáveis para um ambiente de hospedagem, dificultando tarefas básicas como chamadas de vídeo, streaming ou acesso a plataformas corporativas.
+
+- **Oscilações constantes na conexão**  
+Os testes realizados evidenciaram uma variação significativa na velocidade de download ao longo do tempo, indicando instabilidade e ausência de controle de qualidade no fornecimento da banda.
+
+- **Cobertura Wi-Fi insuficiente**  
+O alcance do sinal era limitado, com áreas na pousada apresentando sinal fraco ou ausência total de conectividade.
+
+- **Equipamentos obsoletos e sem gerenciamento**  
+A infraestrutura era composta por dispositivos antigos, sem suporte a tecnologias modernas como Wi-Fi 5/6, e não havia nenhum tipo de controle centralizado, dificultando o monitoramento e a manutenção da rede.
+
+Esse diagnóstico reforça a necessidade e urgência da modernização da infraestrutura, visando garantir estabilidade, desempenho e segurança compatíveis com os padrões atuais de conectividade.
+""",
+    },
+    "pousada-rede-nova": {
+        "descricao": """Este relatório apresenta a análise do desempenho da nova infraestrutura de internet instalada na pousada, com base em testes realizados após a modernização de alguns pontos da rede.
+O objetivo é avaliar os ganhos obtidos em termos de estabilidade, cobertura e velocidade de conexão, comparando com os resultados da rede anterior.""",
+        "subtitulo": "Análise Técnica – Nova Infraestrutura de Rede",
+        "analise": """
+A nova infraestrutura de rede foi implementada com o objetivo de solucionar os diversos problemas técnicos identificados anteriormente e elevar o padrão de conectividade da pousada. Após a modernização, foram realizados novos testes para validar os avanços obtidos em desempenho, estabilidade e cobertura.
+
+#### Melhorias Observadas
+
+- **Aumento significativo na velocidade de conexão**  
+A nova infraestrutura permite taxas de download muito superiores às da rede anterior, garantindo uma navegação rápida e fluida, mesmo em horários de pico ou com múltiplos dispositivos conectados simultaneamente.
+
+- **Melhoria na estabilidade e desempenho geral**  
+Embora pequenas oscilações ainda possam ser observadas, a nova rede opera em um patamar significativamente superior ao anterior. Os testes mostram que a velocidade de download se mantém consistentemente acima de 100 Mbps, mesmo nos momentos de maior uso. Isso representa um avanço importante em confiabilidade para aplicações críticas, como sistemas internos, chamadas de vídeo e plataformas de gestão.
+
+Esse novo cenário garante uma conectividade robusta, estável e segura, compatível com os padrões de exigência atuais e com a expectativa dos hóspedes por uma internet de qualidade.
+""",
+    },
+}
+
+
+VELOCIDADES_RECOMENDADAS = {
+    "Uso": [
+        "Navegação profissional e demandas diárias",
+        "Transmissão de vídeo em HD",
+        "Transmissão de vídeo em 4K",
+        "Streaming de música",
+        "Videochamadas individuais"
+    ],
+    "Velocidade Recomendada (Mbps)": [
+        "15 - 25",
+        "25",
+        "100",
+        "5",
+        "25"
+    ],
+    "Observações": [
+        "Inclui navegação, e-mails, documentos e sistemas online",
+        "Netflix, YouTube e outros em qualidade HD",
+        "Para streaming de altíssima qualidade sem travar",
+        "Spotify, Deezer ou similares",
+        "Zoom, Meet ou Teams com boa estabilidade de vídeo"
+    ]
+}